@@ -0,0 +1,58 @@
+"""Benchmark @cached and @logged wrapper creation and call overhead.
+
+Compares the default ``decorator.decorator`` wrapping with ``fast=True``
+wrapping by :func:`moretools._signature.fastwrap`::
+
+    python benchmarks/wrapping.py
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+from __future__ import print_function
+
+import logging
+from timeit import repeat
+
+from moretools import cached, logged
+
+
+def func(one, two=2):
+    return one
+
+
+def best(stmt, number):
+    """Get the best time per call of `stmt` in microseconds.
+    """
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    logger = logging.getLogger(__name__)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    decorators = [
+      ('@cached', cached, cached(fast=True)),
+      ('@logged', logged[logger].debug, logged.fast[logger].debug),
+      ]
+    print("%-8s %-12s %12s %12s" % ("", "", "default", "fast=True"))
+    for name, default, fast in decorators:
+        decoration = [
+          best(lambda: deco(func), 2000) for deco in (default, fast)]
+        print("%-8s %-12s %10.2fus %10.2fus" % (
+          name, "decoration", decoration[0], decoration[1]))
+
+        calls = []
+        for deco in default, fast:
+            wrapper = deco(func)
+            wrapper(1, 2)
+            calls.append(best(lambda: wrapper(1, 2), 200000))
+        print("%-8s %-12s %10.2fus %10.2fus" % (
+          name, "call", calls[0], calls[1]))
+
+    baseline = best(lambda: func(1, 2), 200000)
+    print("%-8s %-12s %10.2fus" % ("(plain)", "call", baseline))
+
+
+if __name__ == '__main__':
+    main()
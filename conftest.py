@@ -0,0 +1,12 @@
+"""Common pytest configuration for the moretools doctests and tests.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import sys
+
+
+collect_ignore = []
+if sys.version_info < (3, 5):  # no async def syntax
+    collect_ignore.extend([
+      'moretools/_cached_async.py', 'test/test_cached_async.py'])
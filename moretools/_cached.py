@@ -26,56 +26,1034 @@ The @cached decorator.
 """
 __all__ = ['cached']
 
-from inspect import getargspec
+import sys
+import inspect
+import sqlite3
+import weakref
+from copy import copy
+from hashlib import sha1
+from threading import Event, Lock
+try:
+    from time import monotonic as _clock
+except ImportError:  # Python 2
+    from time import time as _clock
+try:
+    from time import perf_counter as _timer
+except ImportError:  # Python 2
+    from timeit import default_timer as _timer
 
 from decorator import decorator
+from six.moves import cPickle as pickle
 
+from . import qualname
 from ._common import *
+from ._signature import argspec, fastwrap
 
 
-def cached(func):
-    argspec = getargspec(func)
+class Results(object):
+    """Base class for bounded :func:`cached` result stores.
+
+    - Implements the subset of the *mapping* interface
+      that the :func:`cached` wrappers use on `wrapper.results`.
+    - Derived classes call :meth:`.evict` for each dropped entry,
+      which passes it on to the optional `on_evict` callback.
+    - Derived classes whose lookups reorder internal state
+      must set `lockfree` to ``False``,
+      to serialize lookups in ``@cached(concurrent=True)`` wrappers.
+    """
+    lockfree = True
+
+    def __init__(self, maxsize=None, on_evict=None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be >= 1, not %r" % maxsize)
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    def evict(self, key, value):
+        """Hook called for every entry dropped by the eviction policy.
+        """
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
+    def __repr__(self):
+        return '%s(maxsize=%r)' % (type(self).__name__, self.maxsize)
+
+
+class FIFOResults(Results):
+    """Drops the oldest inserted entry when `maxsize` is exceeded.
+    """
+    def __init__(self, maxsize):
+        Results.__init__(self, maxsize)
+        self._data = OrderedDict()
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        data = self._data
+        data[key] = value
+        if len(data) > self.maxsize:
+            self.evict(*data.popitem(last=False))
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+
+class LRUResults(FIFOResults):
+    """Drops the least recently used entry when `maxsize` is exceeded.
+    """
+    if PY2:  # no OrderedDict.move_to_end
+        lockfree = False
+
+        def __getitem__(self, key):
+            data = self._data
+            value = data.pop(key)
+            data[key] = value
+            return value
+
+    else:
+        def __getitem__(self, key):
+            data = self._data
+            value = data[key]
+            data.move_to_end(key)
+            return value
+
+
+class LFUResults(Results):
+    """Drops the least frequently used entry when `maxsize` is exceeded.
+
+    - Entries with equal use counts are dropped in insertion order.
+    - Keeps one insertion ordered key bucket per use count,
+      so that lookups and evictions don't need to search for the minimum.
+    """
+    lockfree = False
+
+    def __init__(self, maxsize):
+        Results.__init__(self, maxsize)
+        self._data = {}
+        self._counts = {}
+        self._buckets = {}
+        self._mincount = 0
+
+    def _touch(self, key):
+        counts = self._counts
+        buckets = self._buckets
+        count = counts[key]
+        bucket = buckets[count]
+        del bucket[key]
+        if not bucket:
+            del buckets[count]
+            if self._mincount == count:
+                self._mincount = count + 1
+        count = counts[key] = count + 1
+        try:
+            buckets[count][key] = None
+        except KeyError:
+            buckets[count] = OrderedDict(((key, None), ))
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._touch(key)
+        return value
+
+    def __setitem__(self, key, value):
+        data = self._data
+        if key in data:
+            data[key] = value
+            self._touch(key)
+            return
+
+        if len(data) >= self.maxsize:
+            buckets = self._buckets
+            bucket = buckets[self._mincount]
+            oldkey = bucket.popitem(last=False)[0]
+            if not bucket:
+                del buckets[self._mincount]
+            del self._counts[oldkey]
+            self.evict(oldkey, data.pop(oldkey))
+        data[key] = value
+        self._counts[key] = 1
+        try:
+            self._buckets[1][key] = None
+        except KeyError:
+            self._buckets[1] = OrderedDict(((key, None), ))
+        self._mincount = 1
+
+    def __delitem__(self, key):
+        del self._data[key]
+        count = self._counts.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            # only rescanned on explicit deletion, never on cache calls
+            self._mincount = min(self._buckets or [0])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def clear(self):
+        self._data.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._mincount = 0
+
+
+class TTLResults(Results):
+    """Drops entries `ttl` seconds after their insertion.
+
+    - Expired entries are purged from the oldest end on every insertion,
+      and on lookup of the expired entry itself.
+    - With `maxsize` given, also drops the oldest entry when exceeded.
+    """
+    # lookups of expired entries delete them
+    lockfree = False
+
+    def __init__(self, ttl, maxsize=None):
+        Results.__init__(self, maxsize)
+        if ttl <= 0:
+            raise ValueError("ttl must be > 0, not %r" % ttl)
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def _purge(self, now):
+        data = self._data
+        while data:
+            key = next(iter(data))
+            expires, value = data[key]
+            if expires > now:
+                break
+            del data[key]
+            self.evict(key, value)
+
+    def __getitem__(self, key):
+        expires, value = self._data[key]
+        if expires <= _clock():
+            del self._data[key]
+            self.evict(key, value)
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        now = _clock()
+        self._purge(now)
+        data = self._data
+        # re-insert to keep the entries ordered by expiration time
+        data.pop(key, None)
+        data[key] = now + self.ttl, value
+        if self.maxsize is not None and len(data) > self.maxsize:
+            key, (_, value) = data.popitem(last=False)
+            self.evict(key, value)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __len__(self):
+        self._purge(_clock())
+        return len(self._data)
+
+    def __iter__(self):
+        self._purge(_clock())
+        return iter(list(self._data))
+
+    def clear(self):
+        self._data.clear()
+
+    def __repr__(self):
+        return '%s(ttl=%r, maxsize=%r)' % (
+          type(self).__name__, self.ttl, self.maxsize)
+
+
+class IdentityKey(object):
+    """:func:`cached` key for an unhashable object,
+       which can also not be weakly referenced.
+    """
+    __slots__ = ['obj']
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __hash__(self):
+        return id(self.obj)
+
+    def __eq__(self, other):
+        return type(other) is IdentityKey and other.obj is self.obj
+
+    def __ne__(self, other):
+        return not self == other
+
+
+class IdentityRef(weakref.ref):
+    """:func:`cached` key for an unhashable object,
+       which can be weakly referenced.
+
+    - Hashed and compared by the identity of the object.
+    """
+    __slots__ = ['_hash']
+
+    def __init__(self, obj, callback=None):
+        super(IdentityRef, self).__init__(obj, callback)
+        self._hash = id(obj)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if type(other) is not IdentityRef:
+            return False
+        obj = self()
+        return obj is not None and obj is other()
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def weakkey(obj):
+    """Get a weak reference to `obj` for usage in :func:`cached` keys.
+
+    - Falls back to an :class:`IdentityRef` if `obj` is not hashable.
+    - Falls back to `obj` itself if it can't be weakly referenced,
+      or to an :class:`IdentityKey` if it's not even hashable.
+    """
+    try:
+        ref = weakref.ref(obj)
+    except TypeError:
+        try:
+            hash(obj)
+        except TypeError:
+            return IdentityKey(obj)
+        return obj
+    try:
+        hash(ref)
+    except TypeError:
+        return IdentityRef(obj)
+    return ref
+
+
+class WeakResults(Results):
+    """Wraps the results store of ``@cached(weak=True)`` wrappers.
+
+    - Drops all entries with weak references to an argument object
+      in their keys as soon as that object gets collected.
+    - `parts` is the function for getting
+      the weak reference candidates from a key.
+    """
+    def __init__(self, results, parts):
+        self.on_evict = None
+        self.results = results
+        self.parts = parts
+        # weak reference --> (watching weak reference, set of keys)
+        self._watched = {}
+        if isinstance(results, Results):
+            results.on_evict = self._evicted
+
+    @property
+    def maxsize(self):
+        return getattr(self.results, 'maxsize', None)
+
+    @property
+    def lockfree(self):
+        results = self.results
+        return results.lockfree if isinstance(results, Results) else True
+
+    def _watch(self, key):
+        watched = self._watched
+        for ref in self.parts(key):
+            if not isinstance(ref, weakref.ref):
+                continue
+            try:
+                watched[ref][1].add(key)
+            except KeyError:
+                watched[ref] = (
+                  weakref.ref(ref(), partial(self._collected, ref)), {key})
+
+    def _unwatch(self, key):
+        watched = self._watched
+        for ref in self.parts(key):
+            try:
+                keys = watched[ref][1]
+            except KeyError:
+                continue
+            keys.discard(key)
+            if not keys:
+                del watched[ref]
+
+    def _collected(self, ref, watcher):
+        try:
+            _, keys = self._watched.pop(ref)
+        except KeyError:
+            return
+
+        for key in keys:
+            self._unwatch(key)
+            try:
+                value = self.results.pop(key)
+            except KeyError:
+                continue
+            self.evict(key, value)
+
+    def _evicted(self, key, value):
+        self._unwatch(key)
+        self.evict(key, value)
+
+    def __getitem__(self, key):
+        return self.results[key]
+
+    def __setitem__(self, key, value):
+        self.results[key] = value
+        self._watch(key)
+
+    def __delitem__(self, key):
+        del self.results[key]
+        self._unwatch(key)
+
+    def __len__(self):
+        return len(self.results)
+
+    def __iter__(self):
+        return iter(self.results)
+
+    def clear(self):
+        self.results.clear()
+        self._watched.clear()
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self.results)
+
+
+def stablekey(key):
+    """Make (nested) :func:`cached` `key` tuples
+       independent from the iteration order of contained sets.
+    """
+    if isinstance(key, tuple):
+        return tuple(map(stablekey, key))
+    if isinstance(key, (set, frozenset)):
+        return tuple(sorted(map(stablekey, key), key=repr))
+    return key
+
+
+def hashkey(key):
+    """The default key hashing function of :class:`Store` types.
+
+    - Returns the same hex digest for equal keys across processes,
+      as long as the contained objects pickle deterministically.
+    """
+    return sha1(pickle.dumps(stablekey(key), protocol=2)).hexdigest()
+
+
+class Store(Results):
+    """Base class for persistent :func:`cached` result stores.
+
+    - Implements the results store interface for :func:`cached`
+      by hashing keys with `hashkey` and serializing results with `dumps`,
+      both must return deterministic values across processes.
+    - Derived classes implement the storage backend
+      with :meth:`.load`, :meth:`.save`, :meth:`.remove`,
+      :meth:`.count`, :meth:`.hashes` and :meth:`.purge`,
+      all working in the current :attr:`.namespace`.
+    - :func:`cached` uses :meth:`.bind` for getting a store
+      with the decorated function's qualified name as namespace.
+    """
+    lockfree = False
+
+    def __init__(
+      self, namespace='', hashkey=hashkey,
+      dumps=partial(pickle.dumps, protocol=pickle.HIGHEST_PROTOCOL),
+      loads=pickle.loads):
+        Results.__init__(self)
+        self.namespace = namespace
+        self.hashkey = hashkey
+        self.dumps = dumps
+        self.loads = loads
+
+    def bind(self, namespace):
+        """Get a copy of this store working in the given `namespace`.
+        """
+        store = copy(self)
+        store.namespace = namespace
+        return store
+
+    def load(self, hashed):
+        """Get the serialized result stored under the `hashed` key.
+
+        - Must raise ``KeyError`` if there is none.
+        """
+        raise NotImplementedError
+
+    def save(self, hashed, data):
+        """Store the serialized result `data` under the `hashed` key.
+        """
+        raise NotImplementedError
+
+    def remove(self, hashed):
+        """Remove the result stored under the `hashed` key.
+
+        - Must raise ``KeyError`` if there is none.
+        """
+        raise NotImplementedError
+
+    def count(self):
+        raise NotImplementedError
+
+    def hashes(self):
+        """Iterate all hashed keys.
+        """
+        raise NotImplementedError
+
+    def purge(self):
+        """Remove all stored results.
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, key):
+        return self.loads(self.load(self.hashkey(key)))
+
+    def __setitem__(self, key, value):
+        self.save(self.hashkey(key), self.dumps(value))
+
+    def __delitem__(self, key):
+        self.remove(self.hashkey(key))
+
+    def __len__(self):
+        return self.count()
+
+    def __iter__(self):
+        return self.hashes()
+
+    def clear(self):
+        self.purge()
+
+    def __repr__(self):
+        return '%s(namespace=%r)' % (type(self).__name__, self.namespace)
+
+
+class SQLiteStore(Store):
+    """Persistent :func:`cached` result store in an SQLite database file.
+
+    - All bound copies of a store share one connection,
+      which is safe for usage from multiple threads.
+    """
+    def __init__(self, path, table='results', **options):
+        Store.__init__(self, **options)
+        self.path = path
+        self.table = table
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection as connection:
+            # allow concurrent readers in other processes
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+              'CREATE TABLE IF NOT EXISTS "%s" ('
+              'namespace TEXT NOT NULL, hash TEXT NOT NULL, '
+              'data BLOB NOT NULL, PRIMARY KEY (namespace, hash))' % table)
+
+    def _execute(self, sql, *args):
+        with self._lock, self._connection as connection:
+            return connection.execute(
+              sql % self.table, (self.namespace, ) + args).fetchall()
+
+    def load(self, hashed):
+        rows = self._execute(
+          'SELECT data FROM "%s" WHERE namespace = ? AND hash = ?', hashed)
+        if not rows:
+            raise KeyError(hashed)
+        return bytes(rows[0][0])
+
+    def save(self, hashed, data):
+        self._execute(
+          'INSERT OR REPLACE INTO "%s" (namespace, hash, data) '
+          'VALUES (?, ?, ?)', hashed, sqlite3.Binary(data))
+
+    def remove(self, hashed):
+        with self._lock, self._connection as connection:
+            cursor = connection.execute(
+              'DELETE FROM "%s" WHERE namespace = ? AND hash = ?'
+              % self.table, (self.namespace, hashed))
+        if not cursor.rowcount:
+            raise KeyError(hashed)
+
+    def count(self):
+        return self._execute(
+          'SELECT COUNT(*) FROM "%s" WHERE namespace = ?')[0][0]
+
+    def hashes(self):
+        return iter([row[0] for row in self._execute(
+          'SELECT hash FROM "%s" WHERE namespace = ?')])
+
+    def purge(self):
+        self._execute('DELETE FROM "%s" WHERE namespace = ?')
+
+    def close(self):
+        self._connection.close()
+
+    def __repr__(self):
+        return '%s(%r, table=%r, namespace=%r)' % (
+          type(self).__name__, self.path, self.table, self.namespace)
+
+
+def make_results(maxsize=None, policy=None, ttl=None):
+    """Create the `wrapper.results` store for :func:`cached`.
+
+    - Returns a plain `dict` if neither `maxsize` nor `ttl` is given.
+    """
+    if policy is None:
+        if ttl is not None:
+            policy = 'ttl'
+        elif maxsize is not None:
+            policy = 'lru'
+        else:
+            return {}
+
+    try:
+        resultstype = cached.policies[policy]
+    except KeyError:
+        raise ValueError(
+          "Unknown cached() policy %r. Choose from: %s" % (
+            policy, ", ".join(sorted(cached.policies))))
+
+    if policy == 'ttl':
+        if ttl is None:
+            raise ValueError("cached(policy='ttl') needs a ttl= value")
+        return resultstype(ttl, maxsize=maxsize)
+
+    if ttl is not None:
+        raise ValueError("ttl= is only supported by cached(policy='ttl')")
+    if maxsize is None:
+        raise ValueError(
+          "cached(policy=%r) needs a maxsize= value" % policy)
+    return resultstype(maxsize)
+
+
+CacheInfo = namedtuple('CacheInfo', [
+  'hits', 'misses', 'maxsize', 'currsize', 'evictions', 'misstime'])
+
+
+class Stats(object):
+    """Counters and instrumentation callbacks of a :func:`cached` wrapper.
+
+    - `misses` counts the actual function calls,
+      and `misstime` sums up their durations in seconds.
+    - Everything else counts as a hit,
+      including waiting for a concurrent miss on the same arguments.
+    - With a `lock` given, the counters are updated under that lock,
+      for wrappers called from multiple threads.
+      The callbacks are called outside of it.
+    """
+    __slots__ = [
+      'hits', 'misses', 'evictions', 'misstime',
+      'on_hit', 'on_miss', 'on_evict', 'lock']
+
+    def __init__(self, on_hit=None, on_miss=None, on_evict=None, lock=None):
+        self.hits = self.misses = self.evictions = 0
+        self.misstime = 0.0
+        self.on_hit = on_hit
+        self.on_miss = on_miss
+        self.on_evict = on_evict
+        self.lock = lock
+
+    def hit(self, key):
+        if self.lock is None:
+            self.hits += 1
+        else:
+            with self.lock:
+                self.hits += 1
+        if self.on_hit is not None:
+            self.on_hit(key)
+
+    def missed(self, key, start):
+        """Count a miss, whose function call began at `start` time.
+        """
+        seconds = _timer() - start
+        if self.lock is None:
+            self.misses += 1
+            self.misstime += seconds
+        else:
+            with self.lock:
+                self.misses += 1
+                self.misstime += seconds
+        if self.on_miss is not None:
+            self.on_miss(key, seconds)
+
+    def evicted(self, key, value):
+        if self.lock is None:
+            self.evictions += 1
+        else:
+            with self.lock:
+                self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def info(self, maxsize, currsize):
+        return CacheInfo(
+          self.hits, self.misses, maxsize, currsize,
+          self.evictions, self.misstime)
+
+
+class InFlight(object):
+    """A result currently computed by another thread.
+    """
+    __slots__ = ['event', 'result', 'exc_info']
+
+    def __init__(self):
+        self.event = Event()
+        self.result = self.exc_info = None
+
+    def wait(self):
+        self.event.wait()
+        if self.exc_info is not None:
+            reraise(*self.exc_info)
+        return self.result
+
+
+def arg_key(args, kwargs):
+    return args[0]
+
+
+def args_key(args, kwargs):
+    return args
+
+
+def kwargs_key(args, kwargs):
+    return args, frozenset(kwargs.items())
+
+
+def weak_arg_key(args, kwargs):
+    return weakkey(args[0])
+
+
+def weak_args_key(args, kwargs):
+    return tuple(map(weakkey, args))
+
+
+def weak_kwargs_key(args, kwargs):
+    return tuple(map(weakkey, args)), frozenset(
+      (name, weakkey(value)) for name, value in kwargs.items())
+
+
+#: The weak :func:`cached` key functions
+#  and their functions for getting the weak reference candidates from keys
+WEAK_KEYS = {
+  arg_key: (weak_arg_key, lambda key: (key, )),
+  args_key: (weak_args_key, lambda key: key),
+  kwargs_key: (weak_kwargs_key, lambda key: chain(
+    key[0], (value for _, value in key[1]))),
+  }
+
+
+def plain_caller(key, getresults, stats):
+    """Create a generic :func:`cached` caller using a `key` function.
+    """
+    def caller(func, *args, **kwargs):
+        results = getresults()
+        k = key(args, kwargs)
+        try:
+            result = results[k]
+        except KeyError:
+            start = _timer()
+            try:
+                result = results[k] = func(*args, **kwargs)
+            finally:
+                stats.missed(k, start)
+            return result
+
+        stats.hit(k)
+        return result
+
+    return caller
+
+
+def concurrent_caller(key, getresults, stats):
+    """Create a thread-safe :func:`cached` caller.
+
+    - Hits are looked up without locking,
+      unless the results store has `lockfree` set to ``False``.
+    - On a miss, only the first thread calls the function.
+      Other threads missing on the same `key` wait for its result.
+      Exceptions, also from storing the result,
+      are re-raised in all waiting threads, but not cached.
+    """
+    lock = Lock()
+    inflight = {}
+
+    def caller(func, *args, **kwargs):
+        results = getresults()
+        k = key(args, kwargs)
+        if results.lockfree if isinstance(results, Results) else True:
+            try:
+                result = results[k]
+            except KeyError:
+                pass
+            else:
+                stats.hit(k)
+                return result
+
+        with lock:
+            try:
+                result = results[k]
+            except KeyError:
+                pending = inflight.get(k)
+                owner = pending is None
+                if owner:
+                    pending = inflight[k] = InFlight()
+            else:
+                pending = None
+        if pending is None:
+            stats.hit(k)
+            return result
+
+        if not owner:
+            result = pending.wait()
+            stats.hit(k)
+            return result
+
+        start = _timer()
+        try:
+            result = func(*args, **kwargs)
+            with lock:
+                results[k] = result
+            pending.result = result
+        except:
+            # also passes failures of the results store to the waiters
+            pending.exc_info = sys.exc_info()
+            raise
+        finally:
+            with lock:
+                del inflight[k]
+            pending.event.set()
+            stats.missed(k, start)
+        return result
+
+    return caller
+
+
+def iscoroutinefunction(func):
     try:  # Python >= 3.5
-        varkw = argspec.varkw
+        check = inspect.iscoroutinefunction
     except AttributeError:
-        varkw = argspec.keywords
+        return False
+    return check(func)
+
+
+def cached(
+  func=None, maxsize=None, policy=None, ttl=None, concurrent=False,
+  on_hit=None, on_miss=None, on_evict=None, weak=False, store=None,
+  fast=False):
+    """Decorator for caching the results of `func` per call arguments.
+
+    - Without options, results are stored forever
+      in the plain ``dict`` `wrapper.results`.
+    - Use ``@cached(maxsize=...)`` for bounding the number of results.
+    - Use ``policy=`` for choosing the eviction strategy:
+      ``'lru'`` (default), ``'lfu'``, ``'fifo'`` or ``'ttl'``,
+      which requires a ``ttl=`` value in seconds
+      (and is implied by just giving ``ttl=``).
+    - Use ``@cached(concurrent=True)`` for thread-safe wrappers,
+      which call `func` only once for concurrent misses on the same arguments.
+    - Coroutine functions get wrapped by coroutine functions.
+      Results are cached instead of the one-time awaitable coroutines,
+      and concurrent awaiters of the same arguments share one task.
+      ``concurrent=True`` is not needed for them.
+    - `wrapper.cache_info()` returns a :class:`CacheInfo` tuple
+      of hits, misses, maxsize, currsize, evictions
+      and misstime, the total duration of all misses in seconds.
+    - The optional callbacks get called
+      as ``on_hit(key)``, ``on_miss(key, seconds)``
+      and ``on_evict(key, result)``.
+    - Use ``@cached(weak=True)`` for only weakly referencing
+      the argument objects in `wrapper.results` keys.
+      Results get dropped as soon as any of their argument objects
+      gets collected. Arguments that can't be weakly referenced
+      are used as they are, or by identity if they're not even hashable.
+      Results that reference their own arguments keep them alive.
+    - Use ``@cached(store=...)`` with a :class:`Store` instance,
+      like :class:`SQLiteStore`, for persisting results across processes.
+      The `store` gets bound to the function's qualified name.
+    - Use ``@cached(fast=True)`` for creating the wrapper
+      with :func:`moretools._signature.fastwrap`
+      instead of ``decorator.decorator``, which compiles source code.
+    """
+    # also validates the options before any function gets decorated
+    results = make_results(maxsize=maxsize, policy=policy, ttl=ttl)
+    if store is not None and (type(results) is not dict or weak):
+        raise ValueError(
+          "cached(store=...) can't be combined with "
+          "maxsize=, policy=, ttl= or weak=")
+    if func is None:
+        return partial(
+          cached, maxsize=maxsize, policy=policy, ttl=ttl,
+          concurrent=concurrent,
+          on_hit=on_hit, on_miss=on_miss, on_evict=on_evict, weak=weak,
+          store=store, fast=fast)
+
+    wrap = fastwrap if fast else decorator
+
+    if store is not None:
+        results = store.bind('%s.%s' % (func.__module__, qualname(func)))
+
+    spec = argspec(func)
+    varkw = spec.varkw or spec.kwonlyargs
+    if varkw:
+        key = kwargs_key
+    elif len(spec.args) == 1 and not spec.varargs:
+        key = arg_key
+    else:
+        key = args_key
+    if weak:
+        key, parts = WEAK_KEYS[key]
+        results = WeakResults(results, parts)
+
+    stats = Stats(
+      on_hit=on_hit, on_miss=on_miss, on_evict=on_evict,
+      lock=Lock() if concurrent else None)
+    if isinstance(results, Results):
+        results.on_evict = stats.evicted
+
+    def cache_info():
+        return stats.info(
+          getattr(wrapper.results, 'maxsize', None), len(wrapper.results))
+
+    coroutine = iscoroutinefunction(func)
+    if concurrent or coroutine or weak:
+        if coroutine:
+            # needs async def syntax (only used with Python >= 3.5)
+            from ._cached_async import async_caller as makecaller
+            if fast:
+                from ._cached_async import fastwrap as wrap
+        elif concurrent:
+            makecaller = concurrent_caller
+        else:
+            makecaller = plain_caller
+        wrapper = wrap(
+          makecaller(key, lambda: wrapper.results, stats), func)
+        wrapper.results = results
+        wrapper.cache_info = cache_info
+        return wrapper
+
     if not varkw:
-        nargs = len(argspec.args)
-        varargs = argspec.varargs
-        if not nargs and not varargs:
-            def cached(func):
+        nargs = len(spec.args)
+        varargs = spec.varargs
+        if not nargs and not varargs and type(results) is dict:
+            def caller(func):
                 try:
-                    return wrapper.result
+                    result = wrapper.result
                 except AttributeError:
-                    result = wrapper.result = func()
+                    start = _timer()
+                    try:
+                        result = wrapper.result = func()
+                    finally:
+                        stats.missed((), start)
                     return result
 
-            wrapper = decorator(cached, func)
+                stats.hits += 1
+                if on_hit is not None:
+                    on_hit(())
+                return result
+
+            wrapper = wrap(caller, func)
+            wrapper.cache_info = lambda: stats.info(
+              None, int(hasattr(wrapper, 'result')))
             return wrapper
 
         if nargs == 1 and not varargs:
-            def cached(func, arg):
+            def caller(func, arg):
                 try:
-                    return wrapper.results[arg]
+                    result = wrapper.results[arg]
                 except KeyError:
-                    result = wrapper.results[arg] = func(arg)
+                    start = _timer()
+                    try:
+                        result = wrapper.results[arg] = func(arg)
+                    finally:
+                        stats.missed(arg, start)
                     return result
+
+                stats.hits += 1
+                if on_hit is not None:
+                    on_hit(arg)
+                return result
         else:
-            def cached(func, *args):
+            def caller(func, *args):
                 try:
-                    return wrapper.results[args]
+                    result = wrapper.results[args]
                 except KeyError:
-                    result = wrapper.results[args] = func(*args)
+                    start = _timer()
+                    try:
+                        result = wrapper.results[args] = func(*args)
+                    finally:
+                        stats.missed(args, start)
                     return result
+
+                stats.hits += 1
+                if on_hit is not None:
+                    on_hit(args)
+                return result
     else:
-        def cached(func, *args, **kwargs):
+        def caller(func, *args, **kwargs):
             key = args, frozenset(kwargs.items())
             try:
-                return wrapper.results[key]
+                result = wrapper.results[key]
             except KeyError:
-                result = wrapper.results[key] = func(*args, **kwargs)
+                start = _timer()
+                try:
+                    result = wrapper.results[key] = func(*args, **kwargs)
+                finally:
+                    stats.missed(key, start)
                 return result
 
-    wrapper = decorator(cached, func)
-    wrapper.results = {}
+            stats.hits += 1
+            if on_hit is not None:
+                on_hit(key)
+            return result
+
+    wrapper = wrap(caller, func)
+    wrapper.results = results
+    wrapper.cache_info = cache_info
     return wrapper
+
+
+cached.CacheInfo = CacheInfo
+cached.Results = Results
+cached.Store = Store
+cached.SQLiteStore = SQLiteStore
+cached.policies = {
+  'fifo': FIFOResults,
+  'lfu': LFUResults,
+  'lru': LRUResults,
+  'ttl': TTLResults,
+  }
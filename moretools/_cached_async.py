@@ -0,0 +1,108 @@
+# python-moretools
+#
+# many more basic tools for python 2/3
+# extending itertools, functools and operator
+#
+# Copyright (C) 2011-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# python-moretools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-moretools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-moretools.  If not, see <http://www.gnu.org/licenses/>.
+
+"""moretools._cached_async
+
+The @cached caller and wrapper for coroutine functions.
+
+- Uses ``async def`` syntax and therefore needs Python >= 3.5.
+  Only imported by :func:`moretools.cached` for coroutine functions.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['async_caller', 'fastwrap']
+
+import asyncio
+from functools import partial, update_wrapper
+from time import perf_counter as _timer
+
+from ._signature import argspec, keywords, positional
+
+
+def async_caller(key, getresults, stats):
+    """Create a :func:`cached` caller for coroutine functions.
+
+    - The caller is a coroutine function itself,
+      so nothing gets scheduled before the returned coroutine is awaited.
+      Hits are returned without involving the event loop.
+    - Concurrent misses on the same `key` share one pending task.
+      Only successful task results get stored.
+      Failed or cancelled tasks are dropped, so the next call retries.
+    """
+    pending = {}
+
+    def done(k, start, task):
+        del pending[k]
+        stats.missed(k, start)
+        if not task.cancelled() and task.exception() is None:
+            getresults()[k] = task.result()
+
+    async def caller(func, *args, **kwargs):
+        k = key(args, kwargs)
+        try:
+            result = getresults()[k]
+        except KeyError:
+            pass
+        else:
+            stats.hit(k)
+            return result
+
+        try:
+            task = pending[k]
+        except KeyError:
+            start = _timer()
+            task = pending[k] = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(partial(done, k, start))
+        else:
+            stats.hit(k)
+        # a cancelled awaiter must not cancel the task for all others
+        return await asyncio.shield(task)
+
+    return caller
+
+
+def fastwrap(caller, func):
+    """Like :func:`moretools._signature.fastwrap`,
+       but creating an ``async def`` wrapper for a coroutine `caller`.
+    """
+    spec = argspec(func)
+    if spec.varkw or spec.kwonlyargs:
+        convert = keywords(func, spec)
+
+        async def wrapper(*args, **kwargs):
+            args, kwargs = convert(args, kwargs)
+            return await caller(func, *args, **kwargs)
+
+    else:
+        nargs = len(spec.args)
+        convert = positional(func, spec)
+        if spec.varargs:
+            async def wrapper(*args, **kwargs):
+                if kwargs or len(args) < nargs:
+                    args = convert(args, kwargs)
+                return await caller(func, *args)
+
+        else:
+            async def wrapper(*args, **kwargs):
+                if kwargs or len(args) != nargs:
+                    args = convert(args, kwargs)
+                return await caller(func, *args)
+
+    return update_wrapper(wrapper, func)
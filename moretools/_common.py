@@ -40,3 +40,54 @@ else:
     _filter = filter
     _filterfalse = filterfalse
     _zip = zip
+
+
+try:
+    ChainMap
+except NameError: # PY2
+    class ChainMap(MutableMapping):
+        """Minimal backport of Python 3's `collections.ChainMap`.
+        """
+        def __init__(self, *maps):
+            self.maps = list(maps) or [{}]
+
+        def __getitem__(self, key):
+            for mapping in self.maps:
+                try:
+                    return mapping[key]
+                except KeyError:
+                    pass
+            raise KeyError(key)
+
+        def __setitem__(self, key, value):
+            self.maps[0][key] = value
+
+        def __delitem__(self, key):
+            try:
+                del self.maps[0][key]
+            except KeyError:
+                raise KeyError(
+                  'Key not found in the first mapping: %r' % (key,))
+
+        def __iter__(self):
+            return iter(set().union(*self.maps))
+
+        def __len__(self):
+            return len(set().union(*self.maps))
+
+        def __contains__(self, key):
+            return any(key in mapping for mapping in self.maps)
+
+        def __repr__(self):
+            return '%s(%s)' % (
+              type(self).__name__, ', '.join(map(repr, self.maps)))
+
+        def copy(self):
+            return type(self)(self.maps[0].copy(), *self.maps[1:])
+
+        def new_child(self, m=None):
+            return type(self)({} if m is None else m, *self.maps)
+
+        @property
+        def parents(self):
+            return type(self)(*self.maps[1:])
@@ -29,11 +29,11 @@ from six.moves import zip
 __all__ = ['multimethod']
 
 import sys
-from inspect import getargspec
 
 from decorator import decorator
 
 from . import qualname
+from ._signature import argspec
 
 
 class Method(object):
@@ -59,7 +59,7 @@ def multimethod(func):
     func_name = func.__name__
     func_qualname = qualname(func)
 
-    argspec = getargspec(func)
+    spec = argspec(func)
 
     def caller(func, self, *args, **kwargs):
         if method.fenter is not None:
@@ -96,7 +96,7 @@ def multimethod(func):
 
     def when(test=None, **args):
         def deco(func):
-            method.dispatch.append(Method(argspec, func, test, **args))
+            method.dispatch.append(Method(spec, func, test, **args))
 
         return deco
 
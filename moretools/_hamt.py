@@ -0,0 +1,270 @@
+# python-moretools
+#
+# many more basic tools for python 2/3
+# extending itertools, functools and operator
+#
+# Copyright (C) 2011-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# python-moretools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-moretools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-moretools.  If not, see <http://www.gnu.org/licenses/>.
+
+"""moretools._hamt
+
+Provides the persistent `HAMT` *mapping* type,
+a hash array mapped trie with structural sharing between versions.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+__all__ = ['HAMT']
+
+try:
+    from collections.abc import Mapping
+except ImportError: # PY2
+    from collections import Mapping
+
+# every trie level consumes 5 bits of the 32 bit key hashes
+_SHIFT = 5
+_MASK = (1 << _SHIFT) - 1
+
+# leaf entries are plain (hash, key, value) tuples,
+# everything else in node arrays are sub-nodes
+
+
+def _hash(key):
+    return hash(key) & 0xFFFFFFFF
+
+
+def _bit(keyhash, shift):
+    return 1 << ((keyhash >> shift) & _MASK)
+
+
+def _index(bitmap, bit):
+    return bin(bitmap & (bit - 1)).count('1')
+
+
+def _match(entry, keyhash, key):
+    return entry[0] == keyhash and (entry[1] is key or entry[1] == key)
+
+
+def _merge(shift, entry, other):
+    """Create a node holding the two leaf entries with different keys.
+    """
+    if entry[0] == other[0]:
+        return _CollisionNode(entry[0], (entry, other))
+    bit, otherbit = _bit(entry[0], shift), _bit(other[0], shift)
+    if bit == otherbit:
+        return _BitmapNode(bit, (_merge(shift + _SHIFT, entry, other),))
+    if bit < otherbit:
+        return _BitmapNode(bit | otherbit, (entry, other))
+    return _BitmapNode(bit | otherbit, (other, entry))
+
+
+def _collapse(node):
+    """Replace a `node` only holding a single leaf entry by that entry.
+    """
+    if len(node.array) == 1 and type(node.array[0]) is tuple:
+        return node.array[0]
+    return node
+
+
+class _BitmapNode(object):
+    """A trie node, with a `bitmap` of the occupied hash slots
+       and a compact `array` of the according leaf entries and sub-nodes.
+    """
+    __slots__ = ['bitmap', 'array']
+
+    def __init__(self, bitmap, array):
+        self.bitmap = bitmap
+        self.array = array
+
+    def get(self, shift, keyhash, key):
+        bit = _bit(keyhash, shift)
+        if not self.bitmap & bit:
+            raise KeyError(key)
+        entry = self.array[_index(self.bitmap, bit)]
+        if type(entry) is tuple:
+            if _match(entry, keyhash, key):
+                return entry[2]
+            raise KeyError(key)
+        return entry.get(shift + _SHIFT, keyhash, key)
+
+    def assoc(self, shift, keyhash, key, value):
+        """Get a new node with `key` set to `value`
+           and whether the `key` was added.
+        """
+        bitmap, array = self.bitmap, self.array
+        bit = _bit(keyhash, shift)
+        index = _index(bitmap, bit)
+        if not bitmap & bit:
+            array = array[:index] + ((keyhash, key, value), ) + array[index:]
+            return _BitmapNode(bitmap | bit, array), True
+
+        entry = array[index]
+        if type(entry) is tuple:
+            if _match(entry, keyhash, key):
+                if entry[2] is value:
+                    return self, False
+                new, added = (keyhash, key, value), False
+            else:
+                new = _merge(shift + _SHIFT, entry, (keyhash, key, value))
+                added = True
+        else:
+            new, added = entry.assoc(shift + _SHIFT, keyhash, key, value)
+            if new is entry:
+                return self, False
+        return _BitmapNode(
+          bitmap, array[:index] + (new, ) + array[index + 1:]), added
+
+    def without(self, shift, keyhash, key):
+        """Get a new node without `key`, or ``None`` if it would be empty.
+
+        - *raises* `KeyError` if `key` is missing
+        """
+        bitmap, array = self.bitmap, self.array
+        bit = _bit(keyhash, shift)
+        if not bitmap & bit:
+            raise KeyError(key)
+        index = _index(bitmap, bit)
+        entry = array[index]
+        if type(entry) is tuple:
+            if not _match(entry, keyhash, key):
+                raise KeyError(key)
+            new = None
+        else:
+            new = entry.without(shift + _SHIFT, keyhash, key)
+        if new is None:
+            if bitmap == bit:
+                return None
+            return _BitmapNode(bitmap ^ bit, array[:index] + array[index + 1:])
+        return _BitmapNode(
+          bitmap, array[:index] + (_collapse(new), ) + array[index + 1:])
+
+    def entries(self):
+        for entry in self.array:
+            if type(entry) is tuple:
+                yield entry
+            else:
+                for subentry in entry.entries():
+                    yield subentry
+
+
+class _CollisionNode(object):
+    """A trie node holding leaf entries with fully equal key hashes.
+    """
+    __slots__ = ['keyhash', 'array']
+
+    def __init__(self, keyhash, array):
+        self.keyhash = keyhash
+        self.array = array
+
+    def get(self, shift, keyhash, key):
+        for entry in self.array:
+            if _match(entry, keyhash, key):
+                return entry[2]
+        raise KeyError(key)
+
+    def assoc(self, shift, keyhash, key, value):
+        if keyhash != self.keyhash:
+            node = _BitmapNode(_bit(self.keyhash, shift), (self, ))
+            return node.assoc(shift, keyhash, key, value)
+
+        for index, entry in enumerate(self.array):
+            if _match(entry, keyhash, key):
+                if entry[2] is value:
+                    return self, False
+                array = self.array[:index] + ((keyhash, key, value), ) \
+                  + self.array[index + 1:]
+                return _CollisionNode(keyhash, array), False
+
+        return _CollisionNode(
+          keyhash, self.array + ((keyhash, key, value), )), True
+
+    def without(self, shift, keyhash, key):
+        for index, entry in enumerate(self.array):
+            if _match(entry, keyhash, key):
+                array = self.array[:index] + self.array[index + 1:]
+                return _CollisionNode(keyhash, array) if array else None
+        raise KeyError(key)
+
+    def entries(self):
+        return iter(self.array)
+
+
+_EMPTY = _BitmapNode(0, ())
+
+
+class HAMT(Mapping):
+    """An immutable *mapping*, implemented as hash array mapped trie.
+
+    - :meth:`.set` and :meth:`.delete` return new versions in O(log n),
+      sharing all unchanged trie nodes with the original version.
+    - Iteration order is defined by the key hashes.
+    """
+    __slots__ = ['_root', '_len']
+
+    def __init__(self, mapping=(), **items):
+        root, length = _EMPTY, 0
+        pairs = mapping
+        if hasattr(mapping, 'keys'):
+            pairs = ((key, mapping[key]) for key in mapping.keys())
+        for source in pairs, items.items():
+            for key, value in source:
+                root, added = root.assoc(0, _hash(key), key, value)
+                length += added
+        self._root = root
+        self._len = length
+
+    @classmethod
+    def _new(cls, root, length):
+        hamt = cls.__new__(cls)
+        hamt._root = root
+        hamt._len = length
+        return hamt
+
+    def set(self, key, value):
+        """Get a new version with `key` set to `value`.
+        """
+        root, added = self._root.assoc(0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return self._new(root, self._len + added)
+
+    def delete(self, key):
+        """Get a new version without `key`.
+
+        - *raises* `KeyError` if `key` is missing
+        """
+        root = self._root.without(0, _hash(key), key)
+        return self._new(_EMPTY if root is None else root, self._len - 1)
+
+    def __getitem__(self, key):
+        return self._root.get(0, _hash(key), key)
+
+    def __iter__(self):
+        for entry in self._root.entries():
+            yield entry[1]
+
+    def __len__(self):
+        return self._len
+
+    def items(self):
+        for entry in self._root.entries():
+            yield entry[1], entry[2]
+
+    def values(self):
+        for entry in self._root.entries():
+            yield entry[2]
+
+    def __repr__(self):
+        return 'HAMT(%s)' % repr(dict(self.items()))
@@ -29,22 +29,33 @@ __all__ = ['logged']
 from decorator import decorator
 
 from ._common import *
+from ._signature import fastwrap
 
 
 class LoggedDeco(object):
     """The @logged decorator.
 
     - Automatically logs function calls as "func.__name__(repr(arg), ...)"
+    - Use @logged.fast... for creating the wrappers
+      with :func:`moretools._signature.fastwrap`
+      instead of ``decorator.decorator``, which compiles source code.
     """
-    def __init__(self, logger=None, level=None):
+    def __init__(self, logger=None, level=None, fast=False):
         self.logger = logger
         self.level = level and level.upper()
+        self.wrap = fastwrap if fast else decorator
+
+    @property
+    def fast(self):
+        return type(self)(logger=self.logger, level=self.level, fast=True)
 
     def __getitem__(self, logger):
-        return type(self)(logger=logger, level=self.level)
+        return type(self)(
+          logger=logger, level=self.level, fast=self.wrap is fastwrap)
 
     def __getattr__(self, level):
-        return type(self)(logger=self.logger, level=level)
+        return type(self)(
+          logger=self.logger, level=level, fast=self.wrap is fastwrap)
 
     def __call__(self, func, logger=None):
         def logged(func, *args, **kwargs):
@@ -57,7 +68,7 @@ class LoggedDeco(object):
               func.__name__, ", ".join(chain(logargs, logkwargs))))
             return func(*args, **kwargs)
 
-        return decorator(logged, func)
+        return self.wrap(logged, func)
 
 
 logged = LoggedDeco()
@@ -26,7 +26,10 @@ Various container types with a combined interface to multiple `dict`s.
 """
 __all__ = ['MultiDictType', 'DictSet', 'DictZip', 'DictStruct']
 
+from array import array
+
 from six import with_metaclass
+from six.moves import zip
 
 from ._common import *
 
@@ -35,12 +38,68 @@ class _NoValue:
     pass
 
 
+def _keyunion(dicts, own=None):
+    """Get the union of the keys of all `dicts` (and of dict `own`)
+       as a `set`.
+
+    - Always rebuilt, in a single ``set.update`` call,
+      because plain dicts don't tell about keys replaced by others.
+    """
+    keys = set(dict.keys(own)) if own is not None else set()
+    keys.update(*(d.keys() for d in dicts))
+    return keys
+
+
+# the optional numpy module, imported on first use of _columns,
+# or False if not installed
+_numpy = None
+
+
+def _getcolumns(getters, keys, default):
+    """Get the values of all `keys` from the `.get` methods of some dicts
+       as one `list` per dict, making one pass over the `keys` per dict.
+
+    - *raises* `KeyError` for the first missing key if `default` is unset
+    """
+    columns = []
+    for get in getters:
+        column = [get(key, default) for key in keys]
+        if default is _NoValue and _NoValue in column:
+            raise KeyError(keys[column.index(_NoValue)])
+        columns.append(column)
+    return columns
+
+
+def _columns(getters, keys, default, typecode):
+    """Get the values of all `keys` from the `.get` methods of some dicts
+       as (n_keys x n_dicts) matrix with items of `array` `typecode`.
+
+    - Returns a `numpy.ndarray` if numpy is installed,
+      or otherwise a `list` of one `array.array` row per key.
+    - *raises* `KeyError` for the first missing key if `default` is unset
+    """
+    global _numpy
+    keys = list(keys)
+    columns = _getcolumns(getters, keys, default)
+    if _numpy is None:
+        try:
+            import numpy as _numpy  # optional
+        except ImportError:
+            _numpy = False
+    if _numpy:
+        matrix = _numpy.array(columns, dtype=typecode)
+        return _numpy.ascontiguousarray(
+          matrix.reshape(len(columns), len(keys)).T)
+    return [array(typecode, [column[index] for column in columns])
+            for index in range(len(keys))]
+
+
 class _MultiDictBase(object):
     def __init__(self, dicts):
         self.__dicts__ = list(dicts)
 
     def __len__(self):
-        return len(set(chain(*(d.keys() for d in self.__dicts__))))
+        return len(_keyunion(self.__dicts__))
 
     def __getitem__(self, key):
         raise NotImplementedError
@@ -51,7 +110,7 @@ class _MultiDictBase(object):
 
 class MultiDictType(_MultiDictBase):
     def keys(self):
-        for key in set(chain(*(d.keys() for d in self.__dicts__))):
+        for key in _keyunion(self.__dicts__):
             yield key
 
     def values(self):
@@ -66,7 +125,7 @@ class MultiDictType(_MultiDictBase):
         return self.keys()
 
     def __contains__(self, key):
-        return key in self.keys()
+        return any(key in d for d in self.__dicts__)
 
 
 class _DictSetMeta(type):
@@ -88,8 +147,16 @@ class DictSet(with_metaclass(_DictSetMeta, MultiDictType)):
 
 
 class DictZip(MultiDictType):
+    """A combined interface to multiple dicts,
+       mapping each key to the tuple of its values in all dicts.
+
+    - Missing values are replaced by the optional `default_value`,
+      which can also be set on the instance or class later,
+      and is resolved once per lookup.
+    - Otherwise, keys missing in any dict raise `KeyError`.
+    """
     def __init__(self, dicts, default_value = _NoValue):
-        super(type(self), self).__init__(self, dicts)
+        super(DictZip, self).__init__(dicts)
 
         if default_value is not _NoValue:
             self.default_value = default_value
@@ -102,41 +169,138 @@ class DictZip(MultiDictType):
             return _NoValue
 
     def __getitem__(self, key):
-        valuetuple = tuple(
-          d.get(key, self._default_value) for d in self.__dicts__)
-        if _NoValue in valuetuple:
+        default = self._default_value
+        valuetuple = tuple(d.get(key, default) for d in self.__dicts__)
+        if default is _NoValue and _NoValue in valuetuple:
             raise KeyError(key)
         return valuetuple
 
+    def getmany(self, keys):
+        """Get an iterator over the value tuples of all `keys`.
+
+        - Makes one pass over the `keys` per dict
+          before yielding the first tuple.
+        - *raises* `KeyError` for the first missing key
+          if there is no `default_value`
+        """
+        keys = list(keys)
+        columns = _getcolumns(
+          [d.get for d in self.__dicts__], keys, self._default_value)
+        if not columns:
+            return iter([()] * len(keys))
+        return zip(*columns)
+
+    def columns(self, keys, typecode='d'):
+        """Get the values of all `keys` as (n_keys x n_dicts) matrix.
+
+        - Returns a `numpy.ndarray` of `typecode` dtype if numpy is installed,
+          or otherwise a `list` of `array.array` rows.
+        """
+        return _columns(
+          [d.get for d in self.__dicts__], keys, self._default_value,
+          typecode)
+
+
+# bumped whenever the __bases__ of an existing DictStruct are replaced,
+# which invalidates all precomputed resolution orders
+_layout = 0
+
+
+def _layers(struct):
+    """Get the resolution order of a `DictStruct` as list of
+       ``(layer, own)`` pairs, cached in `struct`.
+
+    - `own` tells if only the own `dict` items of the `layer` count,
+      which is the case for all `DictStruct` layers.
+    - Layers are ordered depth first and appear only once.
+    """
+    cache = struct.__dict__.get('__layers__')
+    if cache is not None and cache[0] == _layout:
+        return cache[1]
+    layers, seen = [(struct, True)], set([id(struct)])
+    for base in struct.__bases__:
+        if isinstance(base, DictStruct):
+            sublayers = _layers(base)
+        else:
+            sublayers = [(base, False)]
+        for layer, own in sublayers:
+            if id(layer) not in seen:
+                seen.add(id(layer))
+                layers.append((layer, own))
+    struct.__dict__['__layers__'] = (_layout, layers)
+    return layers
+
 
 class DictStruct(MultiDictType, dict):
+    """A `dict` of own items, inheriting further items from `__bases__`.
+
+    - Like `ChainMap`, writes and deletions only affect the own items.
+      Other layers are written through :attr:`.maps`.
+    - :meth:`.new_child` and :attr:`.parents` push and pop scopes in O(1).
+    """
     def __init__(self, name, bases, mapping=None, **items):
         self.__name__ = name
-        self.__bases__ = tuple(bases)
+        self.__dict__['__bases__'] = tuple(bases)
         if mapping is None:
             dict.__init__(self, **items)
         else:
             dict.__init__(self, mapping, **items)
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name == '__bases__':
+            global _layout
+            _layout += 1
+
+    @property
+    def maps(self):
+        """The layers in resolution order, starting with this struct.
+
+        - Writing to a `DictStruct` layer sets its own items.
+        """
+        return [layer for layer, _ in _layers(self)]
+
+    def new_child(self, mapping=None, **items):
+        """Create a child scope struct with this struct as only base.
+        """
+        return type(self)(self.__name__, [self], mapping, **items)
+
+    @property
+    def parents(self):
+        """The struct without the own items of this one.
+
+        - Returns the only base if it is a `DictStruct`,
+          which pops a :meth:`.new_child` scope.
+        - Otherwise creates a new struct without own items.
+        """
+        bases = self.__bases__
+        if len(bases) == 1 and isinstance(bases[0], DictStruct):
+            return bases[0]
+        return DictStruct(self.__name__, bases)
+
     def __len__(self):
-        return len(set(chain(
-          dict.keys(self), *(d.keys() for d in self.__bases__))))
+        return len(_keyunion(self.__bases__, own=self))
+
+    def __contains__(self, key):
+        for layer, own in _layers(self):
+            if dict.__contains__(layer, key) if own else key in layer:
+                return True
+        return False
 
     def __getitem__(self, key):
-        try:
-            return dict.__getitem__(self, key)
-        except KeyError:
-            for d in self.__bases__:
+        for layer, own in _layers(self):
+            if own:
+                if dict.__contains__(layer, key):
+                    return dict.__getitem__(layer, key)
+            else:
                 try:
-                    return d[key]
+                    return layer[key]
                 except KeyError:
                     pass
         raise KeyError(key)
 
     def keys(self):
-        for key in set(chain(
-          dict.keys(self), *(d.keys() for d in self.__bases__)
-          )):
+        for key in _keyunion(self.__bases__, own=self):
             yield key
 
     def __repr__(self):
@@ -35,13 +35,92 @@ __all__ = [
 from ._common import *
 
 from ._multidict import *
-from ._multidict import _NoValue, _MultiDictBase
+from ._multidict import _NoValue, _MultiDictBase, _columns
+from ._simpledict import (
+  SimpleDictStructType, SimpleDictViewType, _track, _depend, _flatten)
+
+
+class _Ambiguous:
+    pass
+
+
+class _KeyIndex(object):
+    """The union of all keys of a multi-simpledict container,
+       mapping each key to the tuple of its owning simpledicts.
+
+    - Stamped with the identities of the `__dicts__` members
+      and the key version of the container,
+      which gets bumped by all changes of the simpledicts
+      that add or remove keys, but not by value changes.
+    - `resolved` maps each key to its single owner or to `_Ambiguous`,
+      and `attrs` does the same for the *attrnames* of the keys,
+      as converted by the owners (created on first use).
+    - Inherited items of simpledict structs are also included.
+    - Indexes of simpledict views, or of structs with uncacheable bases,
+      are `volatile` and get rebuilt on every access,
+      because their mappings can also be changed directly.
+    """
+    __slots__ = ['dicts', 'version', 'volatile', 'owners', 'resolved', 'attrs']
+
+    def __init__(self, dicts, version):
+        self.dicts = tuple(dicts)
+        self.version = version
+        self.volatile = False
+        owners = self.owners = {}
+        for d in dicts:
+            if isinstance(d, SimpleDictStructType) and d.__bases__:
+                items, cacheable = _flatten(d)
+                keys = items.keys()
+                self.volatile = self.volatile or not cacheable
+            else:
+                keys = d.__dict__.keys()
+                self.volatile = self.volatile \
+                  or isinstance(d, SimpleDictViewType)
+            for key in keys:
+                try:
+                    owners[key] += (d, )
+                except KeyError:
+                    owners[key] = (d, )
+        self.resolved = dict(
+          (key, owning[0] if len(owning) == 1 else _Ambiguous)
+          for key, owning in owners.items())
+        self.attrs = None
+
+    def resolve_attr(self, name):
+        """Get the single owner of attribute `name` or `_Ambiguous`.
+
+        - *raises* `KeyError` if no simpledict has an item named `name`
+        """
+        attrs = self.attrs
+        if attrs is None:
+            attrs = self.attrs = {}
+            for key, owning in self.owners.items():
+                for d in owning:
+                    attrname = type(d).key_to_attr(key)
+                    attrs[attrname] = d if attrname not in attrs \
+                      else _Ambiguous
+        return attrs[name]
+
+
+def _keyindex(multidict):
+    """Get the up-to-date :class:`_KeyIndex` of `multidict`.
+    """
+    dicts = multidict.__dicts__
+    index = multidict.__dict__.get('__keyindex__')
+    if index is None or len(index.dicts) != len(dicts) \
+      or not all(map(is_, index.dicts, dicts)):
+        _depend(multidict, dicts)
+    elif not index.volatile \
+      and index.version == _track(multidict).keyversion:
+        return index
+    index = _KeyIndex(dicts, _track(multidict).keyversion)
+    object.__setattr__(multidict, '__keyindex__', index)
+    return index
 
 
 class MultiSimpleDictMeta(type):
     def keys(cls, self):
-        return iter(set(chain(*(
-          d.__dict__.keys() for d in self.__dicts__))))
+        return iter(_keyindex(self).owners)
 
     def items(cls, self):
         for key in type(cls).keys(cls, self):
@@ -66,11 +145,37 @@ class MultiSimpleDictType(_MultiDictBase):
     def __dir__(self):
         return list(set(chain(*(dir(d) for d in self.__dicts__))))
 
+    def __len__(self):
+        return len(_keyindex(self).owners)
+
     def __contains__(self, item):
+        if type(self).iterate == 'keys':
+            try:
+                return item in _keyindex(self).owners
+            except TypeError: # unhashable
+                return False
         return item in iter(self)
 
 
 class SimpleDictSetMeta(MultiSimpleDictMeta):
+    def _resolve(cls, self, key, owners):
+        """Get the value of `key` from its `owners`.
+        """
+        if len(owners) > 1:
+            if cls.multiple_key_handler:
+                return cls.multiple_key_handler(
+                  key, [d[key] for d in owners])
+            raise cls.MultipleKey(key)
+        return owners[0][key]
+
+    def items(cls, self):
+        for key, owners in list(_keyindex(self).owners.items()):
+            yield key, cls._resolve(self, key, owners)
+
+    def values(cls, self):
+        for key, owners in list(_keyindex(self).owners.items()):
+            yield cls._resolve(self, key, owners)
+
     class MultipleKeyError(LookupError):
         pass
 
@@ -89,26 +194,20 @@ class SimpleDictSetMeta(MultiSimpleDictMeta):
 class SimpleDictSetType(
   with_metaclass(SimpleDictSetMeta, MultiSimpleDictType)
   ):
+    """A combined interface to multiple simpledicts.
+
+    - Keys and attribute names are resolved with a table
+      mapping them to their single owning simpledict,
+      or to an ambiguity marker for triggering the handlers,
+      which is rebuilt after any change of the simpledicts.
+    """
     def __getitem__(self, key):
         cls = type(self) # holds the helper methods and custom options
-        ## ivalues = (d.__dict__.get(key, _NoValue) for d in self.__dicts__)
-
-        def values():
-            for d in self.__dicts__:
-                try:
-                    yield d[key]
-                except KeyError:
-                    yield _NoValue
-
-        values = [v for v in values() if v is not _NoValue]
-        if not values:
-            raise KeyError(key)
-        if len(values) > 1:
-            if cls.multiple_key_handler:
-                return cls.multiple_key_handler(key, values)
-            else:
-                raise cls.MultipleKey(key)
-        return values[0]
+        index = _keyindex(self)
+        owner = index.resolved[key] # *raises* `KeyError`
+        if owner is _Ambiguous:
+            return cls._resolve(self, key, index.owners[key])
+        return owner[key]
 
     def __setitem__(self, key, value):
         cls = type(self)
@@ -121,6 +220,14 @@ class SimpleDictSetType(
 
     def __getattr__(self, name):
         cls = type(self) # holds the helper methods and custom options
+        if not name.startswith('__'): # is no real (internal) attribute?
+            try:
+                owner = _keyindex(self).resolve_attr(name)
+            except KeyError: # no item, but maybe a non-item attribute
+                pass
+            else:
+                if owner is not _Ambiguous:
+                    return getattr(owner, name)
         ivalues = (getattr(d, name, _NoValue) for d in self.__dicts__)
         values = [v for v in ivalues if v is not _NoValue]
         if not values:
@@ -175,7 +282,21 @@ simpledictset.MultipleKeyError = SimpleDictSetType.MultipleKeyError
 simpledictset.MultipleAttributeError = SimpleDictSetType.MultipleAttributeError
 
 
-class SimpleDictZipType(MultiSimpleDictType):
+class SimpleDictZipMeta(MultiSimpleDictMeta):
+    def columns(cls, self, keys, typecode='d'):
+        """Get the values of all `keys` as (n_keys x n_dicts) matrix.
+
+        - Returns a `numpy.ndarray` of `typecode` dtype if numpy is installed,
+          or otherwise a `list` of `array.array` rows.
+        """
+        return _columns(
+          [d.__dict__.get for d in self.__dicts__], keys, cls.default_value,
+          typecode)
+
+
+class SimpleDictZipType(
+  with_metaclass(SimpleDictZipMeta, MultiSimpleDictType)
+  ):
     def __getitem__(self, key):
         cls = type(self) # holds the helper methods and custom options
         valuetuple = tuple(
@@ -0,0 +1,210 @@
+# python-moretools
+#
+# many more basic tools for python 2/3
+# extending itertools, functools and operator
+#
+# Copyright (C) 2011-2016 Stefan Zimmermann <zimmermann.code@gmail.com>
+#
+# python-moretools is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# python-moretools is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public License
+# along with python-moretools.  If not, see <http://www.gnu.org/licenses/>.
+
+"""moretools._signature
+
+Memoized function signature analysis for the decorators.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+__all__ = ['argspec', 'fastwrap']
+
+import inspect
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+
+CO_VARARGS = inspect.CO_VARARGS
+CO_VARKEYWORDS = inspect.CO_VARKEYWORDS
+
+
+ArgSpec = namedtuple('ArgSpec', [
+  'args', 'varargs', 'varkw', 'kwonlyargs', 'defaults'])
+
+
+#: code object --> ArgSpec without defaults,
+#  only keeping the most recently analyzed ones,
+#  because many decorator generated or exec'd functions have own code objects
+_argspecs = OrderedDict()
+_argspecs_maxsize = 1024
+
+
+def _code_argspec(code):
+    """Get the argument names of a function from its `code` object.
+    """
+    nargs = code.co_argcount
+    nkwonly = getattr(code, 'co_kwonlyargcount', 0)  # Python 3 only
+    names = code.co_varnames
+    args = names[:nargs]
+    kwonlyargs = names[nargs:nargs + nkwonly]
+    index = nargs + nkwonly
+    varargs = varkw = None
+    if code.co_flags & CO_VARARGS:
+        varargs = names[index]
+        index += 1
+    if code.co_flags & CO_VARKEYWORDS:
+        varkw = names[index]
+    return ArgSpec(list(args), varargs, varkw, list(kwonlyargs), None)
+
+
+def _signature_argspec(func):
+    """Get the argument names of any other callable `func`.
+    """
+    try:
+        signature = inspect.signature
+    except AttributeError:  # Python 2
+        spec = inspect.getargspec(func)
+        return ArgSpec(
+          spec.args, spec.varargs, spec.keywords, [], spec.defaults)
+
+    P = inspect.Parameter
+    args, kwonlyargs, defaults = [], [], []
+    varargs = varkw = None
+    for param in signature(func).parameters.values():
+        if param.kind in (P.POSITIONAL_ONLY, P.POSITIONAL_OR_KEYWORD):
+            args.append(param.name)
+            if param.default is not P.empty:
+                defaults.append(param.default)
+        elif param.kind is P.VAR_POSITIONAL:
+            varargs = param.name
+        elif param.kind is P.KEYWORD_ONLY:
+            kwonlyargs.append(param.name)
+        elif param.kind is P.VAR_KEYWORD:
+            varkw = param.name
+    return ArgSpec(args, varargs, varkw, kwonlyargs, tuple(defaults) or None)
+
+
+def argspec(func):
+    """Get an :class:`ArgSpec` of `func`'s arguments.
+
+    - Like the deprecated ``inspect.getargspec``,
+      but also supporting keyword-only arguments.
+    - For plain functions and methods, the analysis is read directly
+      from the code object flags, and memoized per code object,
+      which is shared by all functions created from the same definition.
+      Only the most recently analyzed code objects are memoized.
+    """
+    func = getattr(func, '__func__', func)
+    try:
+        code = func.__code__
+    except AttributeError:
+        return _signature_argspec(func)
+
+    try:
+        spec = _argspecs[code]
+    except KeyError:
+        spec = _argspecs[code] = _code_argspec(code)
+        try:
+            while len(_argspecs) > _argspecs_maxsize:
+                _argspecs.popitem(last=False)
+        except KeyError:  # emptied by concurrent calls
+            pass
+    defaults = func.__defaults__
+    if defaults is None:
+        return spec
+    return spec._replace(defaults=defaults)
+
+
+def positional(func, spec):
+    """Create a function for converting call arguments of `func`
+       to the positional arguments tuple
+       that ``decorator.decorator``-generated wrappers would pass on.
+    """
+    convert = keywords(func, spec)
+
+    def positional(args, kwargs):
+        return convert(args, kwargs)[0]
+
+    return positional
+
+
+def keywords(func, spec):
+    """Create a function for converting call arguments of `func`
+       to the ``(args, kwargs)`` pair
+       that ``decorator.decorator``-generated wrappers would pass on,
+       with all defaults applied.
+
+    - Raises the same `TypeError` as `func` for invalid arguments.
+    """
+    if not hasattr(inspect, 'signature'):  # Python 2
+        def convert(args, kwargs):
+            callargs = inspect.getcallargs(func, *args, **kwargs)
+            args = tuple(callargs[name] for name in spec.args)
+            if spec.varargs:
+                args += callargs[spec.varargs]
+            return args, callargs[spec.varkw] if spec.varkw else {}
+
+        return convert
+
+    signatures = []
+
+    def convert(args, kwargs):
+        # only analyzed on first usage, to keep wrapper creation cheap
+        if not signatures:
+            signatures.append(inspect.signature(func))
+        try:
+            bound = signatures[0].bind(*args, **kwargs)
+        except TypeError as exc:
+            # like the error of calling `func` directly
+            raise TypeError("%s() %s" % (func.__name__, exc))
+        bound.apply_defaults()
+        return bound.args, bound.kwargs
+
+    return convert
+
+
+def fastwrap(caller, func):
+    """Decorator-free equivalent of ``decorator.decorator(caller, func)``.
+
+    - Creates a wrapper calling ``caller(func, *args, **kwargs)``
+      without compiling any source code.
+    - Copies `func`'s metadata with ``functools.update_wrapper``,
+      whose ``wrapper.__wrapped__`` also makes ``inspect.signature``
+      report `func`'s signature.
+    - Like the generated wrappers, passes all arguments positionally
+      to `caller` if `func` has neither ``**kwargs`` nor keyword-only args.
+      Only calls with keyword, left out default or surplus arguments
+      take the slower path of binding them to `func`'s signature.
+    - Otherwise, all calls get bound to `func`'s signature,
+      to pass on the same arguments for equivalent calls.
+    """
+    spec = argspec(func)
+    if spec.varkw or spec.kwonlyargs:
+        convert = keywords(func, spec)
+
+        def wrapper(*args, **kwargs):
+            args, kwargs = convert(args, kwargs)
+            return caller(func, *args, **kwargs)
+
+    else:
+        nargs = len(spec.args)
+        convert = positional(func, spec)
+        if spec.varargs:
+            def wrapper(*args, **kwargs):
+                if kwargs or len(args) < nargs:
+                    args = convert(args, kwargs)
+                return caller(func, *args)
+
+        else:
+            def wrapper(*args, **kwargs):
+                if kwargs or len(args) != nargs:
+                    args = convert(args, kwargs)
+                return caller(func, *args)
+
+    return update_wrapper(wrapper, func)
@@ -31,6 +31,8 @@ import zetup
 
 __all__ = [
   'SimpleDictType', 'SimpleFrozenDictType', 'SimpleDictStructType',
+  'SimpleDictFieldsType', 'SimpleDictViewType',
+  'SimpleDictPersistentType', 'SimpleDictObservableType',
   'simpledict', 'issimpledict', 'issimpledictclass',
   'issimplefrozendict', 'issimplefrozendictclass',
   'issimpledictstruct', 'issimpledictstructclass',
@@ -39,8 +41,14 @@ __all__ = [
 from warnings import warn
 from inspect import isclass
 import re as _re
+import weakref
+try:
+    from collections.abc import MutableMapping
+except ImportError: # PY2
+    from collections import MutableMapping
 
 from ._common import *
+from ._hamt import HAMT
 
 
 class KeyToAttrError(AttributeError):
@@ -74,9 +82,21 @@ class SimpleDictMeta(zetup.meta):
       which additionally hold the custom options
       (like internal mapping type
        and *key*<-->*attrname* conversion functions).
+    - Remembers the results of successful conversion checks
+      in tables shared by all classes of a derived metaclass,
+      holding up to `checked_maxsize` entries each.
+      Use :meth:`.clear_checked` after changing conversion functions.
     """
     _re_attrname = _re.compile('^[A-Za-z_][A-Za-z0-9_]*$')
 
+    checked_maxsize = 1024
+
+    # membership mode of `in` checks (defaults to `iterate` option)
+    contains = None
+
+    # created per derived metaclass by :func:`simpledict`
+    _checked_attrs = _checked_keys = None
+
     def _check_attr(cls, key, attrname):
         """Check (`key`-->)`attrname` validity.
         """
@@ -102,6 +122,228 @@ class SimpleDictMeta(zetup.meta):
         if attr_from_key != attrname:
             raise AttrToKeyToAttrMismatch(attrname, key, attr_from_key)
 
+    def _remember(cls, table, key, value):
+        if table is not None:
+            if len(table) >= cls.checked_maxsize:
+                table.clear()
+            table[key] = value
+
+    def _checked_attr(cls, key):
+        """Get the checked `key`-->attrname conversion result.
+
+        - *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+        """
+        table = cls._checked_attrs
+        try:
+            return table[key]
+        except (KeyError, TypeError):  # unknown, unhashable, or no table
+            pass
+        attrname = str(cls.key_to_attr(key))
+        cls._check_attr(key, attrname)
+        cls._reverse_check_key(key, attrname)
+        cls._remember(table, key, attrname)
+        return attrname
+
+    def _checked_key(cls, attrname):
+        """Get the checked `attrname`-->key conversion result.
+
+        - *raises* `AttrToKeyToAttrMismatch`
+        """
+        table = cls._checked_keys
+        try:
+            return table[attrname]
+        except (KeyError, TypeError):
+            pass
+        key = cls.attr_to_key(attrname)
+        cls._reverse_check_attr(attrname, key)
+        cls._remember(table, attrname, key)
+        return key
+
+    def clear_checked(cls):
+        """Forget all remembered *key*<-->*attrname* conversion checks.
+        """
+        for table in cls._checked_attrs, cls._checked_keys:
+            if table is not None:
+                table.clear()
+
+    def has_item(cls, simpledict, item):
+        """Check if `simpledict` has a (*key*, *value*) pair `item`,
+           with a direct *key* lookup.
+        """
+        if type(item) is not tuple or len(item) != 2:
+            return False
+        key, value = item
+        try:
+            stored = simpledict[key]
+        except (KeyError, TypeError):
+            return False
+        return stored is value or stored == value
+
+    def _checked_new(cls):
+        """Get a function for creating instances from `dicttype` mappings,
+           which checks every *key* only once and bypasses `__init__`.
+
+        - View types are instantiated with the mappings,
+          and persistent types with a :class:`HAMT` copy of them.
+        """
+        if issubclass(cls, SimpleDictStructType):
+            raise TypeError(
+              "%s instances can't be created from records" % cls)
+        fields = getattr(cls, '__fields__', None)
+        checked = set()
+
+        def check(keys):
+            for key in keys:
+                if key not in checked:
+                    if fields is None:
+                        # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+                        cls._checked_attr(key)
+                    elif key not in fields:
+                        raise KeyError(key)
+                    checked.add(key)
+
+        if issubclass(cls, SimpleDictPersistentType):
+            def create(__dict__):
+                return cls._new(HAMT(__dict__))
+
+        elif issubclass(cls, SimpleDictViewType):
+            create = cls
+
+        elif fields is None:
+            def create(__dict__):
+                obj = object.__new__(cls)
+                object.__setattr__(obj, '__dict__', __dict__)
+                return obj
+
+        else:
+            def create(__dict__):
+                obj = object.__new__(cls)
+                for key, value in __dict__.items():
+                    fields[key].__set__(obj, value)
+                return obj
+
+        def new(__dict__):
+            if not checked.issuperset(__dict__):
+                check(__dict__)
+            return create(__dict__)
+
+        return new
+
+    def from_records(cls, records):
+        """Create a list of instances from an iterable of `records`.
+
+        - Each record can be anything accepted by `dicttype`,
+          like a *mapping* or a sequence of *key*/*value* pairs.
+        - *key*<-->*attrname* conversions are only checked once per *key*,
+          so many records sharing the same keys are created much faster.
+        """
+        new = cls._checked_new()
+        dicttype = cls.dicttype
+        return [new(dicttype(record)) for record in records]
+
+    def from_columns(cls, columns=(), **kwcolumns):
+        """Create a list of instances from a mapping
+           of *keys* to equally long sequences of *values*.
+
+        - Each key's *attrname* conversion is checked only once.
+        """
+        columns = cls.dicttype(columns, **kwcolumns)
+        keys = list(columns.keys())
+        values = [columns[key] for key in keys]
+        if len(set(map(len, values))) > 1:
+            raise ValueError("Columns must have equal lengths.")
+        new = cls._checked_new()
+        dicttype = cls.dicttype
+        return [new(dicttype(zip(keys, row))) for row in zip(*values)]
+
+
+def _internkey(items):
+    """Get the :class:`SimpleFrozenDictInternMeta` registry key
+       of the `items` mapping.
+
+    - Includes the value types, to not share instances
+      between equal values of different types, like ``1`` and ``True``.
+    - *raises* `TypeError` for unhashable values
+    """
+    return frozenset(
+      (key, type(value), value) for key, value in items.items())
+
+
+class SimpleFrozenDictInternMeta(SimpleDictMeta):
+    """The metaclass extension for frozen simpledict types,
+       which share one instance per distinct content.
+
+    - :func:`simpledict` derives it from its custom metaclass
+      when called with ``intern=True``,
+      together with an own `interned` registry per frozen type,
+      which only holds weak references to the instances.
+    - Instances with unhashable values are not interned.
+    - Interned instances keep the item order of their first creation.
+    - Instances created by :meth:`.from_records`
+      and :meth:`.from_columns` are also interned.
+    """
+    def _checked_new(cls):
+        new = SimpleDictMeta._checked_new(cls)
+        interned = cls.interned
+
+        def intern(__dict__):
+            try:
+                key = _internkey(__dict__)
+            except TypeError:  # unhashable values
+                return new(__dict__)
+            try:
+                return interned[key]
+            except KeyError:
+                return interned.setdefault(key, new(__dict__))
+
+        return intern
+
+    def __call__(cls, mapping=(), **items):
+        items = cls.dicttype(mapping, **items)
+        try:
+            key = _internkey(items)
+        except TypeError:  # unhashable values
+            return SimpleDictMeta.__call__(cls, items)
+        try:
+            return cls.interned[key]
+        except KeyError:
+            return cls.interned.setdefault(
+              key, SimpleDictMeta.__call__(cls, items))
+
+
+class SimpleDictObservableMeta(SimpleDictMeta):
+    """The metaclass extension for observable simpledict types.
+
+    - :func:`simpledict` derives its custom metaclass from it
+      when called with ``observable=True``.
+    - Provides the class level methods for dirty-tracking and notifications.
+    """
+    def changed(cls, simpledict):
+        """Get the set of keys changed since the last :meth:`.commit`.
+        """
+        return frozenset(_changedkeys(simpledict))
+
+    def subscribe(cls, simpledict, callback):
+        """Let :meth:`.commit` call `callback(simpledict, changedkeys)`.
+        """
+        _subscribers(simpledict).append(callback)
+
+    def unsubscribe(cls, simpledict, callback):
+        _subscribers(simpledict).remove(callback)
+
+    def commit(cls, simpledict):
+        """Reset the changed keys of `simpledict`
+           and notify all subscribers once if there were any.
+
+        :returns: The set of changed keys.
+        """
+        changed = frozenset(_changedkeys(simpledict))
+        simpledict.__changed__ = set()
+        if changed:
+            for callback in list(_subscribers(simpledict)):
+                callback(simpledict, changed)
+        return changed
+
 
 class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
     """A simple *mapping* type providing item value access
@@ -120,6 +362,9 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
     - Doesn't provide any **non**-*special methods*.
     - `.__iter__()` returns an items (key/value pairs) iterator by default
       (can be overridden with `iterate` option).
+    - `in` checks look for the same kind of elements
+      (can be overridden with `contains` option),
+      with direct key lookups for 'keys' and 'items'.
     """
     def __init__(self, mapping=(), **items):
         """Instantiate the SimpleDictType with optional initial values.
@@ -127,13 +372,9 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
         cls = type(self) # holds the helper methods and custom options
         self.__dict__ = cls.dicttype(mapping, **items)
         for key in self.__dict__.keys():
-            attrname = cls.key_to_attr(key)
-            # check attribute name validity
-            # *raises* `KeyToAttrError`
-            cls._check_attr(key, attrname)
-            # check reverse attr-->key conversion
-            # *raises* `KeyToAttrToKeyMismatch`
-            cls._reverse_check_key(key, attrname)
+            # check attribute name validity and reverse attr-->key conversion
+            # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+            cls._checked_attr(key)
 
     def __getattr__(self, name):
         cls = type(self) # holds the helper methods and custom options
@@ -148,10 +389,9 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
         if name.startswith('__'): # is real (internal) attribute?
             object.__setattr__(self, name, value)
         else: # convert name to key and store in `self.__dict__`
-            key = cls.attr_to_key(name)
             # check reverse key-->attr conversion
             # *raises* `AttrToKeyToAttrMismatch`
-            cls._reverse_check_attr(name, key)
+            key = cls._checked_key(name)
             # accept name/value pair
             self[key] = value
 
@@ -161,6 +401,7 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
             raise AttributeError(name)
         key = cls.attr_to_key(name)
         del self.__dict__[key]
+        _changed(self)
 
     def __dir__(self):
         cls = type(self) # holds the helper methods and custom options
@@ -172,6 +413,16 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
         return iter(iter_func())
 
     def __contains__(self, item):
+        cls = type(self) # holds the helper methods and custom options
+        contains = cls.contains or cls.iterate
+        if contains == 'keys':
+            try:
+                self[item]
+            except (KeyError, TypeError):
+                return False
+            return True
+        if contains == 'items':
+            return cls.has_item(self, item)
         return item in iter(self)
 
     def __len__(self):
@@ -179,34 +430,45 @@ class SimpleDictType(with_metaclass(SimpleDictMeta, zetup.object)):
 
     def __setitem__(self, key, value):
         cls = type(self) # holds the helper methods and custom options
-        attrname = str(cls.key_to_attr(key))
-        # check attribute name validity
-        # *raises* `KeyToAttrError`
-        cls._check_attr(key, attrname)
-        # check reverse attr-->key conversion
-        # *raises* `KeyToAttrToKeyMismatch`
-        cls._reverse_check_key(key, attrname)
+        # check attribute name validity and reverse attr-->key conversion
+        # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+        cls._checked_attr(key)
         # accept the key/value pair
-        self.__dict__[key] = value
+        items = self.__dict__
+        added = key not in items
+        items[key] = value
+        _changed(self, keys=added)
 
     def __getitem__(self, key):
         return self.__dict__[key]
 
     def __delitem__(self, key):
         del self.__dict__[key]
+        _changed(self)
 
     def __repr__(self):
         return 'simpledict(%s)' % repr(self.__dict__)
 
+    def __reduce_ex__(self, protocol):
+        reduced = _reduce(self)
+        if reduced is None: # not created by :func:`simpledict`
+            return object.__reduce_ex__(self, protocol)
+        return _restore, reduced
+
 
 class SimpleFrozenDictType(object):
     """Like :class:`SimpleDictType`,
-       but without support for setting values after instantiation.
+       but without support for setting or deleting values
+       after instantiation.
 
     - Custom frozen simpledict types are generated
       together with the normal custom simpledict types in :func:`simpledict`,
       stored as CustomType.frozen.
     """
+    # no own instance `__dict__` descriptor, which would hide the one
+    # of fields types and the `__dict__` properties of derived types
+    __slots__ = ()
+
     def __setattr__(self, name, value):
         if name.startswith('__'): # is real (internal) attribute?
             object.__setattr__(self, name, value)
@@ -216,20 +478,211 @@ class SimpleFrozenDictType(object):
     def __setitem__(self, name, value):
         raise NotImplementedError
 
+    def __delattr__(self, name):
+        if name.startswith('__'): # is real (internal) attribute?
+            object.__delattr__(self, name)
+        else:
+            raise NotImplementedError
+
+    def __delitem__(self, name):
+        raise NotImplementedError
+
     @classmethod
     def type(cls, simpledicttype=SimpleDictType):
+        # the `__dict__` property of fields types
+        itemsdict = next((
+          base.__dict__['__dict__'] for base in simpledicttype.__mro__
+          if '__dict__' in base.__dict__), None)
+        if not isinstance(itemsdict, property):
+            itemsdict = None
+
         class SimpleFrozenDictType(cls, simpledicttype):
-            pass
+            __slots__ = ()
+
+            if itemsdict is not None:
+                # would otherwise get its own instance `__dict__` descriptor
+                __dict__ = itemsdict
 
         return SimpleFrozenDictType
 
 
+# trackers of simpledicts involved in simpledict struct inheritance,
+# by object id
+_trackers = {}
+
+
+class _Tracker(object):
+    """Tracks changes of a simpledict, which is a simpledict struct
+       or a base of one, with a version stamp.
+
+    - Changes are propagated to the trackers of all dependent structs,
+      which invalidates their flattened item caches.
+    - Also tracks the simpledicts of multi-simpledict containers,
+      with the containers as dependents.
+    - `keyversion` is only bumped by changes which add or remove keys.
+    - `uncacheable` holds the `keyversion` at which the struct was found
+      to have bases that are no simpledicts.
+    """
+    __slots__ = [
+      'ref', 'version', 'keyversion', 'flat', 'uncacheable',
+      'bases', 'dependents']
+
+    def __init__(self, obj):
+        key = id(obj)
+        self.ref = weakref.ref(obj, lambda _: _trackers.pop(key, None))
+        self.version = self.keyversion = 0
+        self.flat = None  # (version, dicttype instance)
+        self.uncacheable = None
+        self.bases = ()  # ids of tracked bases
+        self.dependents = set()  # ids of dependent structs or containers
+
+    def changed(self, keys=True):
+        self.version += 1
+        if keys:
+            self.keyversion += 1
+        for key in list(self.dependents):
+            dependent = _trackers.get(key)
+            if dependent is None:  # struct was collected
+                self.dependents.discard(key)
+            else:
+                dependent.changed(keys)
+
+
+def _track(obj):
+    """Get the :class:`_Tracker` of simpledict `obj`.
+    """
+    try:
+        return _trackers[id(obj)]
+    except KeyError:
+        tracker = _trackers[id(obj)] = _Tracker(obj)
+        return tracker
+
+
+def _changed(obj, keys=True):
+    """Bump the version of simpledict `obj` if it is tracked.
+
+    - `keys` tells if keys might have been added or removed,
+      which also bumps the key version.
+    """
+    tracker = _trackers.get(id(obj))
+    if tracker is not None:
+        tracker.changed(keys)
+
+
+def _depend(obj, bases):
+    """Let all changes of the simpledicts in `bases`
+       bump the version of `obj`, instead of the former bases.
+    """
+    key = id(obj)
+    tracker = _track(obj)
+    for basekey in tracker.bases:
+        base = _trackers.get(basekey)
+        if base is not None:
+            base.dependents.discard(key)
+    bases = [b for b in bases if isinstance(b, SimpleDictType)]
+    for base in bases:
+        _track(base).dependents.add(key)
+    tracker.bases = tuple(id(b) for b in bases)
+    tracker.changed()
+
+
+def _rebase(struct):
+    """Update the base dependencies after setting `struct.__bases__`.
+    """
+    _depend(struct, struct.__bases__)
+
+
+class _Deleted:
+    pass
+
+
+class _CopyOnWriteMap(ChainMap):
+    """A `ChainMap` writing all changes to its first mapping,
+       which also records deletions of items from the other mappings
+       by storing `_Deleted` markers.
+    """
+    def __getitem__(self, key):
+        value = ChainMap.__getitem__(self, key)
+        if value is _Deleted:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        changes = self.maps[0]
+        return (key for key in ChainMap.__iter__(self)
+                if changes.get(key) is not _Deleted)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        return ChainMap.__contains__(self, key) \
+          and self.maps[0].get(key) is not _Deleted
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        if any(key in mapping for mapping in self.maps[1:]):
+            self.maps[0][key] = _Deleted
+        else:
+            del self.maps[0][key]
+
+    # instead of the `ChainMap` ones only working on the first mapping
+    pop = MutableMapping.pop
+    popitem = MutableMapping.popitem
+    clear = MutableMapping.clear
+
+
+def _flatten(struct):
+    """Get all items of `struct`, including the inherited ones,
+       as a `dicttype` instance, and whether it can be cached.
+
+    - The result is cached with the version stamp of the struct
+      if all bases are (tracked) simpledicts.
+      Simpledict views are not tracked,
+      because their mappings can also be changed directly.
+    """
+    tracker = _track(struct)
+    flat = tracker.flat
+    if flat is not None and flat[0] == tracker.version:
+        return flat[1], True
+
+    version = tracker.version
+    cls = type(struct)
+    items = cls.dicttype()
+    cacheable = True
+    for base in struct.__bases__[::-1]:
+        if isinstance(base, SimpleDictStructType):
+            baseitems, basecacheable = _flatten(base)
+            cacheable = cacheable and basecacheable
+            items.update(baseitems)
+        elif isinstance(base, SimpleDictViewType):
+            cacheable = False
+            items.update(base.__dict__)
+        elif isinstance(base, SimpleDictType):
+            items.update(base.__dict__)
+        else:
+            cacheable = False
+            items.update(base)
+    items.update(struct.__dict__)
+    if cacheable:
+        tracker.flat = (version, items)
+    else:
+        tracker.uncacheable = tracker.keyversion
+    return items, cacheable
+
+
 class SimpleDictStructType(object):
     """Like :class:`SimpleDictType`,
        but with support for dynamic item inheritance from other simpledicts,
        which acts like member inheritance from base classes.
 
     - Calling creates a new basic simpledict from all inherited items.
+    - The flattened inherited items are cached with a version stamp,
+      which gets bumped when the struct or any of its bases changes.
+      Structs with any bases that are no simpledicts
+      or are simpledict views can't be cached,
+      and look up items in their bases one by one instead.
     - Custom simpledict struct types are generated
       together with the normal custom simpledict types in :func:`simpledict`,
       stored as CustomType.struct.
@@ -241,8 +694,20 @@ class SimpleDictStructType(object):
         self.__name__ = name
         self.__bases__ = tuple(bases)
 
+    def __setattr__(self, name, value):
+        type(self).base.__setattr__(self, name, value)
+        if name == '__bases__':
+            _rebase(self)
+
     def __getitem__(self, name):
         cls = type(self)
+        if not self.__bases__:
+            return cls.base.__getitem__(self, name)
+        tracker = _track(self)
+        if tracker.uncacheable != tracker.keyversion:
+            items, cacheable = _flatten(self)
+            if cacheable:
+                return items[name]
         try:
             return cls.base.__getitem__(self, name)
         except KeyError:
@@ -254,15 +719,9 @@ class SimpleDictStructType(object):
         raise KeyError(name)
 
     def __iter__(self):
-        cls = type(self)
-        try:
-            __dict__ = cls.dicttype(self.__bases__[-1])
-        except IndexError:
-            return cls.base.__iter__(self)
-        for base in self.__bases__[-2::-1]:
-            __dict__.update(base)
-        __dict__.update(cls.base.__iter__(self))
-        return iter(__dict__.items())
+        if not self.__bases__:
+            return type(self).base.__iter__(self)
+        return iter(_flatten(self)[0].items())
 
     def __dir__(self):
         cls = type(self)
@@ -271,9 +730,22 @@ class SimpleDictStructType(object):
             names.update(dir(base))
         return list(names)
 
-    def __call__(self):
-        #TODO
-        raise NotImplementedError
+    def __call__(self, view=False):
+        """Create a new basic simpledict from all inherited items.
+
+        :param view: Instead of copying the items,
+          create a copy-on-write CustomType.view,
+          backed by a `ChainMap` of a new `dict` for changed items
+          and the flattened struct items.
+          Deleted struct items are recorded in the `dict` of changes.
+          Later changes of the struct don't affect the view,
+          because the flattened items get replaced instead of updated.
+        """
+        cls = type(self)
+        items = _flatten(self)[0]
+        if view:
+            return cls.view(_CopyOnWriteMap({}, items))
+        return cls.plain(items)
 
     def __repr__(self):
         return self.__name__
@@ -286,12 +758,434 @@ class SimpleDictStructType(object):
         return SimpleDictStructType
 
 
+def _fielditems(obj):
+    """Iterate the (key, value) pairs
+       of a :class:`SimpleDictFieldsType` instance `obj`.
+    """
+    cls = type(obj)
+    for key, slot in cls.__fields__.items():
+        try:
+            yield key, slot.__get__(obj, cls)
+        except AttributeError:  # unset slot
+            pass
+
+
+class SimpleDictFieldsType(object):
+    """Like :class:`SimpleDictType`,
+       but with a fixed set of keys, whose values are stored in `__slots__`.
+
+    - Custom simpledict fields types are generated by :func:`simpledict`
+      instead of the normal custom simpledict types,
+      when called with a list of `fields` keys.
+      Their CustomType.frozen types are also fields based.
+    - Instances don't hold any internal mapping.
+      `.__dict__` returns a new `dicttype` instance with all set items.
+    - Setting items with keys not in `fields` raises a `KeyError`.
+    """
+    __slots__ = ()
+
+    def __init__(self, mapping=(), **items):
+        fields = type(self).__fields__
+        for key, value in dict(mapping, **items).items():
+            try:
+                slot = fields[key]
+            except KeyError:
+                raise KeyError(key)
+            slot.__set__(self, value)
+
+    @property
+    def __dict__(self):
+        return type(self).dicttype(_fielditems(self))
+
+    def __delattr__(self, name):
+        if name.startswith('__'): # is real (internal) attribute?
+            raise AttributeError(name)
+        try:
+            del self[type(self).attr_to_key(name)]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __dir__(self):
+        cls = type(self)
+        return [cls.key_to_attr(key) for key, _ in _fielditems(self)]
+
+    def __iter__(self):
+        cls = type(self)
+        if cls.iterate == 'items':
+            return _fielditems(self)
+        if cls.iterate == 'keys':
+            return (key for key, _ in _fielditems(self))
+        if cls.iterate == 'values':
+            return (value for _, value in _fielditems(self))
+        return iter(getattr(self.__dict__, cls.iterate)())
+
+    def __len__(self):
+        return sum(1 for _ in _fielditems(self))
+
+    def __setitem__(self, key, value):
+        try:
+            slot = type(self).__fields__[key]
+        except (KeyError, TypeError):
+            raise KeyError(key)
+        try:
+            slot.__get__(self, type(self))
+        except AttributeError:  # unset slot
+            added = True
+        else:
+            added = False
+        slot.__set__(self, value)
+        _changed(self, keys=added)
+
+    def __getitem__(self, key):
+        cls = type(self)
+        try:
+            return cls.__fields__[key].__get__(self, cls)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+
+    def __delitem__(self, key):
+        try:
+            type(self).__fields__[key].__delete__(self)
+        except (AttributeError, TypeError):
+            raise KeyError(key)
+        _changed(self)
+
+    @classmethod
+    def type(cls, simpledicttype=SimpleDictType):
+        itemsdict = cls.__dict__['__dict__']
+
+        class SimpleDictFieldsType(cls, simpledicttype):
+            __slots__ = ()
+
+            # would otherwise get its own instance `__dict__` descriptor
+            __dict__ = itemsdict
+
+        return SimpleDictFieldsType
+
+
+class SimpleDictViewType(object):
+    """Like :class:`SimpleDictType`,
+       but storing the items in a given *mapping*
+       instead of an own `dicttype` instance.
+
+    - Custom simpledict view types are generated
+      together with the normal custom simpledict types in :func:`simpledict`,
+      stored as CustomType.view.
+      ``simpledict.view`` is the view type of a default simpledict family.
+    - The *mapping* is neither copied nor checked on instantiation.
+      Keys are checked lazily on attribute access and on `dir()`.
+      Read-only mappings like `types.MappingProxyType` are also supported.
+    - Item changes are written to the *mapping*.
+    """
+    __slots__ = ['__mapping__']
+
+    def __init__(self, mapping):
+        self.__mapping__ = mapping
+
+    @property
+    def __dict__(self):
+        return self.__mapping__
+
+    def __getattr__(self, name):
+        if name.startswith('__'): # is real (internal) attribute?
+            raise AttributeError(name)
+        cls = type(self) # holds the helper methods and custom options
+        # *raises* `AttrToKeyToAttrMismatch`
+        key = cls._checked_key(name)
+        try:
+            value = self.__mapping__[key]
+        except KeyError:
+            raise AttributeError(name)
+        # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+        cls._checked_attr(key)
+        return value
+
+    def __dir__(self):
+        cls = type(self) # holds the helper methods and custom options
+        return [cls._checked_attr(key) for key in self.__mapping__.keys()]
+
+    def __repr__(self):
+        return 'simpledict(%s)' % repr(type(self).dicttype(self.__mapping__))
+
+    @classmethod
+    def type(cls, simpledicttype=SimpleDictType):
+        mapping = cls.__dict__['__dict__']
+
+        class SimpleDictViewType(cls, simpledicttype):
+            __slots__ = ()
+
+            # would otherwise get its own instance `__dict__` descriptor
+            __dict__ = mapping
+
+        return SimpleDictViewType
+
+
+def _check_observable(obj):
+    if not isinstance(obj, SimpleDictObservableType):
+        raise TypeError("%s is not an observable simpledict" % repr(obj))
+
+
+def _changedkeys(obj):
+    """Get the set of changed keys of observable simpledict `obj`.
+    """
+    try:
+        return obj.__changed__
+    except AttributeError:  # created without `__init__`
+        _check_observable(obj)
+        changed = set()
+        object.__setattr__(obj, '__changed__', changed)
+        return changed
+
+
+def _subscribers(obj):
+    """Get the list of subscribers of observable simpledict `obj`.
+    """
+    try:
+        return obj.__subscribers__
+    except AttributeError:  # created without `__init__`
+        _check_observable(obj)
+        subscribers = []
+        object.__setattr__(obj, '__subscribers__', subscribers)
+        return subscribers
+
+
+class SimpleDictObservableType(object):
+    """Like :class:`SimpleDictType`,
+       but recording the keys of changed items for batched notifications.
+
+    - Custom observable simpledict types are generated by :func:`simpledict`
+      instead of the normal custom simpledict types,
+      when called with ``observable=True``.
+    - CustomType.changed(instance) returns the keys
+      set or deleted since the last CustomType.commit(instance),
+      which calls all callbacks registered with CustomType.subscribe()
+      once with the instance and the changed keys.
+    """
+    __slots__ = ['__changed__', '__subscribers__']
+
+    def __init__(self, mapping=(), **items):
+        super(SimpleDictObservableType, self).__init__(mapping, **items)
+        self.__changed__ = set()
+        self.__subscribers__ = []
+
+    def __setitem__(self, key, value):
+        super(SimpleDictObservableType, self).__setitem__(key, value)
+        _changedkeys(self).add(key)
+
+    def __delitem__(self, key):
+        super(SimpleDictObservableType, self).__delitem__(key)
+        _changedkeys(self).add(key)
+
+    def __delattr__(self, name):
+        super(SimpleDictObservableType, self).__delattr__(name)
+        _changedkeys(self).add(type(self).attr_to_key(name))
+
+    @classmethod
+    def type(cls, simpledicttype=SimpleDictType):
+        class SimpleDictObservableType(cls, simpledicttype):
+            __slots__ = ()
+
+        return SimpleDictObservableType
+
+
+class SimpleDictPersistentType(SimpleFrozenDictType):
+    """Like :class:`SimpleFrozenDictType`,
+       but hashable, and storing the items in a persistent :class:`HAMT`.
+
+    - Custom persistent simpledict types are generated
+      together with the normal custom simpledict types in :func:`simpledict`,
+      stored as CustomType.persistent.
+    - `.set(key, value)` and `.delete(key)` return new instances in O(log n),
+      which share all unchanged items with the original instance.
+      Items with *attrname* 'set' or 'delete' are therefore
+      only accessible by key.
+    - The hash value is only calculated once from all items.
+    - Instances are equal to instances of the same type with equal items.
+    - Iteration order is defined by the key hashes, not by `dicttype`.
+    """
+    __slots__ = ['__items__', '__hashvalue__']
+
+    def __init__(self, mapping=(), **items):
+        cls = type(self) # holds the helper methods and custom options
+        items = HAMT(mapping, **items)
+        for key in items:
+            # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+            cls._checked_attr(key)
+        self.__items__ = items
+        self.__hashvalue__ = None
+
+    @classmethod
+    def _new(cls, items):
+        obj = object.__new__(cls)
+        object.__setattr__(obj, '__items__', items)
+        object.__setattr__(obj, '__hashvalue__', None)
+        return obj
+
+    @property
+    def __dict__(self):
+        return self.__items__
+
+    def set(self, key, value):
+        """Get a new instance with `key` set to `value`.
+        """
+        cls = type(self) # holds the helper methods and custom options
+        # *raises* `KeyToAttrError` or `KeyToAttrToKeyMismatch`
+        cls._checked_attr(key)
+        items = self.__items__.set(key, value)
+        if items is self.__items__:
+            return self
+        return cls._new(items)
+
+    def delete(self, key):
+        """Get a new instance without `key`.
+
+        - *raises* `KeyError` if `key` is missing
+        """
+        return type(self)._new(self.__items__.delete(key))
+
+    def __delattr__(self, name):
+        raise NotImplementedError
+
+    def __delitem__(self, key):
+        raise NotImplementedError
+
+    def __hash__(self):
+        if self.__hashvalue__ is None:
+            self.__hashvalue__ = hash(frozenset(self.__items__.items()))
+        return self.__hashvalue__
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return other is self or (
+          len(other.__items__) == len(self.__items__)
+          and other.__items__ == self.__items__)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __repr__(self):
+        return 'simpledict(%s)' % repr(type(self).dicttype(self.__items__))
+
+    @classmethod
+    def type(cls, simpledicttype=SimpleDictType):
+        items = cls.__dict__['__dict__']
+
+        class SimpleDictPersistentType(cls, simpledicttype):
+            __slots__ = ()
+
+            # would otherwise get its own instance `__dict__` descriptor
+            __dict__ = items
+
+        return SimpleDictPersistentType
+
+
+# the families of types created by :func:`simpledict`,
+# mapping type ids to their custom metaclasses
+_families = weakref.WeakValueDictionary()
+
+# the attribute names of the types in the custom metaclasses
+_variants = ('plain', 'frozen', 'persistent', 'view', 'struct')
+
+
+def _reduce(obj):
+    """Get the (typeid, variant, args) of simpledict `obj`
+       for recreating it with :func:`_restore`,
+       or ``None`` if its type was not directly created by :func:`simpledict`.
+    """
+    cls = type(obj)
+    typeid = getattr(type(cls), 'typeid', None)
+    # not `type(cls)` for the derived metaclasses of interned frozen types
+    metaclass = _families.get(typeid) if typeid is not None else None
+    if metaclass is None:
+        return None
+    for variant in _variants:
+        if getattr(metaclass, variant, None) is cls:
+            break
+    else:
+        return None
+    items = obj.__dict__
+    if not isinstance(items, dict): # like HAMT or ChainMap
+        items = dict(items.items())
+    if variant == 'struct':
+        return typeid, variant, (obj.__name__, list(obj.__bases__), items)
+    return typeid, variant, (items, )
+
+
+def _restore(typeid, variant, args):
+    """Recreate a simpledict from the :func:`_reduce` results.
+    """
+    try:
+        metaclass = _families[typeid]
+    except KeyError:
+        raise LookupError(
+          "No simpledict types registered with typeid %s" % repr(typeid))
+    return getattr(metaclass, variant)(*args)
+
+
+def _encode(obj):
+    """Get a JSON or msgpack serializable representation of simpledict `obj`.
+    """
+    reduced = _reduce(obj)
+    if reduced is None:
+        raise TypeError("%s is not serializable" % repr(obj))
+    typeid, variant, args = reduced
+    return {'__simpledict__': [typeid, variant], 'args': list(args)}
+
+
+def _decode(data):
+    """Recreate a simpledict from an :func:`_encode` result.
+    """
+    try:
+        typeid, variant = data['__simpledict__']
+    except KeyError:
+        return data
+    return _restore(typeid, variant, data['args'])
+
+
+def _codec(name):
+    if name == 'json':
+        import json
+        return (lambda obj: json.dumps(obj, default=_encode),
+                lambda data: json.loads(data, object_hook=_decode))
+    if name == 'msgpack':
+        import msgpack  # optional
+        return (lambda obj: msgpack.packb(
+                  obj, default=_encode, use_bin_type=True),
+                lambda data: msgpack.unpackb(
+                  data, object_hook=_decode, raw=False))
+    raise ValueError("Unknown codec %s" % repr(name))
+
+
+def dumps(obj, codec='json'):
+    """Serialize `obj` with simpledicts using the given `codec`.
+
+    - Simpledicts are written as their type id, variant and raw items.
+    - Available codecs are 'json' and 'msgpack' (needs the msgpack package).
+    """
+    return _codec(codec)[0](obj)
+
+
+def loads(data, codec='json'):
+    """Deserialize the :func:`dumps` results `data`.
+
+    - The simpledict types must be registered under the same type ids.
+    """
+    return _codec(codec)[1](data)
+
+
 def simpledict(
-  typename, dicttype=dict, iterate='items',
+  typename, dicttype=dict, iterate='items', contains=None,
   key_to_attr=lambda key: key, attr_to_key=lambda name: name,
   base=SimpleDictType, frozenbase=SimpleFrozenDictType,
   structbase=SimpleDictStructType,
-  extra={},
+  extra={}, fields=None, fieldsbase=SimpleDictFieldsType,
+  viewbase=SimpleDictViewType, persistentbase=SimpleDictPersistentType,
+  intern=False, observable=False,
+  observablebase=SimpleDictObservableType, typeid=None,
   #DEPRECATED:
   basetype=None, frozenbasetype=None, basestructtype=None,
   ):
@@ -302,6 +1196,21 @@ def simpledict(
       used for items' *key*-->*attrname* conversions.
     :param attr_to_key: The *function*
       used for items' *attrname*-->*key* conversions.
+    :param contains: What `in` checks look for.
+      One of 'keys', 'items' or 'values'. Defaults to `iterate`.
+    :param fields: An optional fixed sequence of *keys*
+      for creating a compact :class:`SimpleDictFieldsType`-derived type,
+      which stores the values in `__slots__`
+      instead of an internal *mapping* per instance.
+    :param intern: Let the CustomType.frozen type
+      return one shared instance per distinct content.
+    :param observable: Create a :class:`SimpleDictObservableType`-derived
+      type, which records the keys of changed items.
+    :param typeid: The id for registering the created types
+      for pickling and :func:`simpledict.dumps`/:func:`simpledict.loads`.
+      Types created later with the same id replace the registered ones.
+      Without `typeid`, the types are not registered,
+      and their instances are pickled by type reference.
     """
     if basetype:
         warn("Use base= instead of basetype=.", DeprecationWarning)
@@ -319,23 +1228,57 @@ def simpledict(
       structbase=structbase,
       dicttype=dicttype,
       iterate=iterate,
+      typeid=typeid,
+      contains=contains,
+      fields=fields if fields is None else tuple(fields),
       key_to_attr=staticmethod(key_to_attr),
       attr_to_key=staticmethod(attr_to_key),
+      _checked_attrs={},
+      _checked_keys={},
       #DEPRECATED:
       basetype=base,
       frozenbasetype=frozenbase,
       basestructtype=structbase,
       )
-    metaclass = type(typename + 'Meta', (SimpleDictMeta,), metaclassattrs)
+    metaclass = type(
+      typename + 'Meta',
+      (SimpleDictObservableMeta if observable else SimpleDictMeta,),
+      metaclassattrs)
+    # for fields based types, first create a common base type
+    # and check the *key*<-->*attrname* conversions only once
+    clsattrs = {}
+    if fields is not None:
+        fieldstype = metaclass(typename, (fieldsbase.type(base),), {})
+        attrnames = []
+        for key in metaclass.fields:
+            attrnames.append(fieldstype._checked_attr(key))
+        clsattrs['__slots__'] = tuple(attrnames)
+
+    def create(name, bases, metaclass=metaclass):
+        cls = metaclass(name, bases, dict(clsattrs))
+        if fields is not None:
+            # map keys to the slot descriptors of this class
+            cls.__fields__ = OrderedDict(
+              (key, cls.__dict__[attrname])
+              for key, attrname in zip(metaclass.fields, attrnames))
+        return cls
+
     # then create a frozen simpledict type ...
     if frozenbasetype:
         warn("Use frozenbase= instead of frozenbasetype=.",
              DeprecationWarning)
         frozenbase = frozenbasetype
     if frozenbase:
-        frozenbase = frozenbase.type(base)
-        metaclass.frozen = metaclass(
-          typename + '.frozen', (frozenbase,), {})
+        frozenbase = frozenbase.type(
+          base if fields is None else fieldstype)
+        frozenmeta = metaclass
+        if intern:
+            frozenmeta = type(
+              typename + '.frozenMeta',
+              (SimpleFrozenDictInternMeta, metaclass),
+              {'interned': weakref.WeakValueDictionary()})
+        metaclass.frozen = create(
+          typename + '.frozen', (frozenbase,), frozenmeta)
     # ... and a simpledict struct type from the custom meta type
     if basestructtype:
         warn("Use structbase= instead of basestructtype=.",
@@ -345,13 +1288,37 @@ def simpledict(
         structbase = structbase.type(base)
         metaclass.struct = metaclass(
           typename + '.struct', (structbase,), {})
+    # ... and a simpledict view type
+    if viewbase:
+        metaclass.view = metaclass(
+          typename + '.view', (viewbase.type(base),), {})
+    # ... and a persistent frozen simpledict type
+    if persistentbase:
+        metaclass.persistent = metaclass(
+          typename + '.persistent', (persistentbase.type(base),), {})
     # finally create the normal simpledict type from the custom meta type
-    return metaclass(typename, (base,), {})
+    plainbase = base if fields is None else fieldstype
+    if observable:
+        plainbase = observablebase.type(plainbase)
+    metaclass.plain = create(typename, (plainbase,))
+    if typeid is not None:
+        _families[typeid] = metaclass
+    return metaclass.plain
 
 
 simpledict.base = SimpleDictType
 simpledict.frozenbase = SimpleFrozenDictType
 simpledict.structbase = SimpleDictStructType
+simpledict.fieldsbase = SimpleDictFieldsType
+simpledict.viewbase = SimpleDictViewType
+simpledict.persistentbase = SimpleDictPersistentType
+simpledict.observablebase = SimpleDictObservableType
+
+
+simpledict.view = simpledict('simpledict', typeid='simpledict').view
+
+simpledict.dumps = dumps
+simpledict.loads = loads
 
 
 simpledict.KeyToAttrError = KeyToAttrError
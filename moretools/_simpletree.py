@@ -9,8 +9,6 @@ import zetup
 import moretools
 from moretools import qualname
 
-from ._cached import cached
-
 __all__ = ('SimpleTree', )
 
 
@@ -74,8 +72,14 @@ class SimpleTreeMeta(zetup.meta, ABCMeta):
         return cls
 
     @property
-    @cached
     def root(cls):
+        # not using a @cached wrapper, not even a weak one, because the root
+        # class references `cls` as its base and would therefore keep it alive
+        try:
+            return cls.__dict__['_simpletree_root']
+        except KeyError:
+            pass
+
         class root(cls):
 
             __module__ = cls.__module__
@@ -83,6 +87,7 @@ class SimpleTreeMeta(zetup.meta, ABCMeta):
 
             _is_simpletree_root = True
 
+        cls._simpletree_root = root
         return root
 
 
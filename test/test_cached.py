@@ -0,0 +1,382 @@
+"""Test the moretools._cached module.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import pytest
+
+from moretools import cached
+
+
+def test_cached():
+    """Test unbounded @cached on the different argument signatures.
+    """
+    calls = []
+
+    @cached
+    def noargs():
+        calls.append(())
+        return object()
+
+    assert noargs() is noargs()
+    assert calls == [()]
+
+    @cached
+    def onearg(arg):
+        calls.append(arg)
+        return [arg]
+
+    assert onearg(1) is onearg(1)
+    assert type(onearg.results) is dict
+    assert list(onearg.results) == [1]
+
+    @cached
+    def kwargs(*args, **kwargs):
+        return object()
+
+    assert kwargs(1, two=2) is kwargs(1, two=2)
+    assert kwargs(1, two=2) is not kwargs(1, two=3)
+
+
+@pytest.mark.parametrize('policy', ['lru', 'lfu', 'fifo'])
+def test_cached_maxsize(policy):
+    """Test that bounded @cached never holds more than `maxsize` results.
+    """
+    @cached(maxsize=3, policy=policy)
+    def func(arg):
+        return [arg]
+
+    for arg in range(10):
+        assert func(arg) is func(arg)
+        assert len(func.results) <= 3
+    assert len(func.results) == 3
+
+
+def test_cached_lru():
+    """Test that @cached(policy='lru') drops the least recently used result.
+    """
+    @cached(maxsize=2)
+    def func(arg):
+        return [arg]
+
+    assert type(func.results) is cached.policies['lru']
+    one = func(1)
+    func(2)
+    assert func(1) is one
+    func(3)
+    assert sorted(func.results) == [1, 3]
+
+
+def test_cached_lfu():
+    """Test that @cached(policy='lfu') drops the least frequently used result.
+    """
+    @cached(maxsize=2, policy='lfu')
+    def func(arg):
+        return [arg]
+
+    one = func(1)
+    assert func(1) is one
+    func(2)
+    func(3)
+    assert sorted(func.results) == [1, 3]
+
+
+def test_cached_fifo():
+    """Test that @cached(policy='fifo') drops the oldest result.
+    """
+    @cached(maxsize=2, policy='fifo')
+    def func(arg):
+        return [arg]
+
+    func(1)
+    func(2)
+    func(1)
+    func(3)
+    assert sorted(func.results) == [2, 3]
+
+
+def test_cached_ttl(monkeypatch):
+    """Test that @cached(ttl=...) drops results after `ttl` seconds.
+    """
+    from moretools import _cached
+
+    now = [0.0]
+    monkeypatch.setattr(_cached, '_clock', lambda: now[0])
+
+    @cached(ttl=10)
+    def noargs():
+        return object()
+
+    assert not noargs.results.lockfree
+    result = noargs()
+    now[0] = 9.0
+    assert noargs() is result
+    now[0] = 10.0
+    assert noargs() is not result
+
+
+def test_cached_invalid_options():
+    """Test that inconsistent @cached options are rejected.
+    """
+    with pytest.raises(ValueError):
+        cached(policy='lru')
+    with pytest.raises(ValueError):
+        cached(policy='ttl')
+    with pytest.raises(ValueError):
+        cached(maxsize=1, policy='unknown')
+    with pytest.raises(ValueError):
+        cached(maxsize=0)
+
+
+def test_cached_concurrent():
+    """Test that @cached(concurrent=True) calls the function only once
+       for concurrent misses on the same argument.
+    """
+    from threading import Event, Thread
+
+    calls = []
+    release = Event()
+
+    @cached(concurrent=True)
+    def func(arg):
+        calls.append(arg)
+        release.wait()
+        return [arg]
+
+    returned = []
+    threads = [
+      Thread(target=lambda: returned.append(func(1))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == [1]
+    assert len(returned) == 8
+    assert all(result is returned[0] for result in returned)
+
+
+def test_cached_concurrent_exception():
+    """Test that exceptions in @cached(concurrent=True) functions
+       are not cached.
+    """
+    calls = []
+
+    @cached(concurrent=True, maxsize=4, policy='lfu')
+    def func(arg):
+        calls.append(arg)
+        if len(calls) == 1:
+            raise RuntimeError(arg)
+        return arg
+
+    with pytest.raises(RuntimeError):
+        func(1)
+    assert func(1) == 1
+    assert func(1) == 1
+    assert calls == [1, 1]
+
+
+def test_cached_concurrent_store_error(tmpdir):
+    """Test that failures of storing results in @cached(concurrent=True)
+       wrappers are re-raised in waiting threads and don't block later calls.
+    """
+    from threading import Event, Thread
+
+    started, release = Event(), Event()
+
+    @cached(concurrent=True, store=cached.SQLiteStore(
+      str(tmpdir.join('cache.db'))))
+    def func(arg):
+        started.set()
+        release.wait()
+        return lambda: arg  # not picklable
+
+    errors = []
+
+    def call():
+        try:
+            func(1)
+        except Exception as exc:
+            errors.append(exc)
+
+    owner = Thread(target=call)
+    owner.start()
+    started.wait()
+    waiter = Thread(target=call)
+    waiter.start()
+    release.set()
+    owner.join()
+    waiter.join()
+    assert len(errors) == 2
+    with pytest.raises(Exception):
+        func(1)
+    assert func.cache_info().misses >= 2
+    func.results.close()
+
+
+def test_cached_concurrent_cache_info():
+    """Test that @cached(concurrent=True) counts all concurrent hits.
+    """
+    import sys
+    from threading import Thread
+
+    @cached(concurrent=True)
+    def func(arg):
+        return [arg]
+
+    func(1)
+
+    def hit():
+        for _ in range(1000):
+            func(1)
+
+    interval = sys.getswitchinterval() if hasattr(sys, 'getswitchinterval') \
+      else None
+    if interval is not None:
+        # switch threads as often as possible to provoke lost updates
+        sys.setswitchinterval(1e-6)
+    try:
+        threads = [Thread(target=hit) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if interval is not None:
+            sys.setswitchinterval(interval)
+    assert func.cache_info()[:2] == (8000, 1)
+
+
+def test_cached_cache_info():
+    """Test wrapper.cache_info() and the instrumentation callbacks.
+    """
+    events = []
+
+    @cached(
+      maxsize=2,
+      on_hit=lambda key: events.append(('hit', key)),
+      on_miss=lambda key, seconds: events.append(('miss', key)),
+      on_evict=lambda key, result: events.append(('evict', key)))
+    def func(arg):
+        return [arg]
+
+    func(1)
+    func(1)
+    func(2)
+    func(3)
+    assert events == [
+      ('miss', 1), ('hit', 1), ('miss', 2), ('evict', 1), ('miss', 3)]
+
+    info = func.cache_info()
+    assert isinstance(info, cached.CacheInfo)
+    assert info[:5] == (1, 3, 2, 2, 1)
+    assert info.misstime >= 0
+
+    @cached
+    def noargs():
+        return object()
+
+    assert noargs.cache_info()[:5] == (0, 0, None, 0, 0)
+    noargs()
+    noargs()
+    assert noargs.cache_info()[:5] == (1, 1, None, 1, 0)
+
+
+def test_cached_weak():
+    """Test that @cached(weak=True) drops results
+       when their argument objects get collected.
+    """
+    import gc
+    import weakref
+
+    class Arg(object):
+        pass
+
+    evicted = []
+
+    @cached(weak=True, on_evict=lambda key, result: evicted.append(result))
+    def func(arg, *args, **kwargs):
+        return len(args) + len(kwargs)
+
+    arg, other = Arg(), Arg()
+    assert func(arg) == 0
+    assert func(arg, 1, other=other) == 2
+    assert func(other, [2]) == 1
+    assert func(arg) == 0
+    assert len(func.results) == 3
+    assert func.cache_info().hits == 1
+
+    del arg
+    gc.collect()
+    assert len(func.results) == 1
+    assert sorted(evicted) == [0, 2]
+
+    del other
+    gc.collect()
+    assert not len(func.results)
+    assert not func.results._watched
+
+    class Unhashable(object):
+        def __eq__(self, other):
+            return self is other
+
+        __hash__ = None
+
+    arg = Unhashable()
+    ref = weakref.ref(arg)
+    assert func(arg) == 0
+    assert func(arg, 1) == 1
+    assert func(arg) == 0
+    assert len(func.results) == 2
+
+    del arg
+    gc.collect()
+    assert ref() is None
+    assert not len(func.results)
+    assert not func.results._watched
+
+
+def test_cached_store(tmpdir):
+    """Test that @cached(store=cached.SQLiteStore(...)) results
+       survive re-decoration with a new store instance.
+    """
+    path = str(tmpdir.join('cache.db'))
+    calls = []
+
+    def func(arg, **kwargs):
+        calls.append(arg)
+        return [arg, kwargs]
+
+    wrapper = cached(func, store=cached.SQLiteStore(path))
+    assert wrapper(1, two=2, three=3) == [1, {'two': 2, 'three': 3}]
+    assert wrapper(1, three=3, two=2) == [1, {'two': 2, 'three': 3}]
+    assert calls == [1]
+    assert len(wrapper.results) == 1
+    wrapper.results.close()
+
+    wrapper = cached(func, store=cached.SQLiteStore(path))
+    assert wrapper(1, two=2, three=3) == [1, {'two': 2, 'three': 3}]
+    assert calls == [1]
+    assert wrapper.cache_info()[:4] == (1, 0, None, 1)
+    wrapper.results.clear()
+    assert not len(wrapper.results)
+
+    with pytest.raises(ValueError):
+        cached(store=cached.SQLiteStore(path), maxsize=1)
+
+
+def test_cached_fast():
+    """Test @cached(fast=True) wrappers created without decorator.decorator.
+    """
+    calls = []
+
+    @cached(fast=True)
+    def func(one, two=2):
+        """Docstring."""
+        calls.append((one, two))
+        return [one, two]
+
+    assert func.__name__ == 'func' and func.__doc__ == "Docstring."
+    assert func(1) is func(1, 2) is func(two=2, one=1)
+    assert calls == [(1, 2)]
+    assert list(func.results) == [(1, 2)]
@@ -0,0 +1,85 @@
+"""Test @cached from the moretools._cached module on coroutine functions.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import asyncio
+
+import pytest
+
+from moretools import cached
+
+
+def run(coro):
+    return asyncio.get_event_loop().run_until_complete(coro)
+
+
+def test_cached_coroutine():
+    """Test that @cached stores results of coroutine functions
+       and shares one task between concurrent awaiters.
+    """
+    calls = []
+
+    @cached
+    async def func(arg):
+        calls.append(arg)
+        await asyncio.sleep(0.01)
+        return [arg]
+
+    async def main():
+        return await asyncio.gather(*(func(1) for _ in range(8)))
+
+    returned = run(main())
+    assert calls == [1]
+    assert all(result is returned[0] for result in returned)
+    assert func.results == {1: returned[0]}
+    assert run(func(1)) is returned[0]
+    assert calls == [1]
+
+
+def test_cached_coroutine_exception():
+    """Test that failed coroutine function tasks are not cached.
+    """
+    calls = []
+
+    @cached(maxsize=2)
+    async def func(arg):
+        calls.append(arg)
+        if len(calls) == 1:
+            raise RuntimeError(arg)
+        return arg
+
+    with pytest.raises(RuntimeError):
+        run(func(1))
+    assert not len(func.results)
+    assert run(func(1)) == 1
+    assert run(func(1)) == 1
+    assert calls == [1, 1]
+
+
+@pytest.mark.parametrize('fast', [False, True])
+def test_cached_coroutine_function(fast):
+    """Test that @cached wrappers of coroutine functions
+       are coroutine functions, which schedule nothing before awaiting.
+    """
+    import inspect
+
+    @cached(fast=fast)
+    async def func(arg, two=2):
+        return [arg, two]
+
+    assert inspect.iscoroutinefunction(func)
+    coro = func(1)
+    assert inspect.iscoroutine(coro)
+    coro.close()
+    assert not func.results
+    assert func.cache_info().misses == 0
+
+    loop = asyncio.new_event_loop()
+    try:
+        result = loop.run_until_complete(func(1))
+        assert result == [1, 2]
+        assert loop.run_until_complete(func(1, two=2)) is result
+    finally:
+        loop.close()
+    assert func.cache_info()[:2] == (1, 1)
@@ -0,0 +1,61 @@
+"""Test the moretools._hamt module.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import random
+
+import pytest
+
+from moretools._hamt import HAMT
+
+
+class Key(object):
+    """Key type with many hash collisions.
+    """
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self):
+        return self.value % 3
+
+    def __eq__(self, other):
+        return isinstance(other, Key) and other.value == self.value
+
+
+def test_hamt():
+    """Test HAMT versions against equivalent dicts.
+    """
+    rand = random.Random(0)
+    hamt, d = HAMT(), {}
+    versions = []
+    for _ in range(500):
+        key = rand.choice([
+          rand.randrange(100), Key(rand.randrange(10)),
+          rand.randrange(1 << 40), str(rand.randrange(100))])
+        if rand.random() < 0.6:
+            hamt = hamt.set(key, key)
+            d[key] = key
+        elif key in d:
+            hamt = hamt.delete(key)
+            del d[key]
+        else:
+            with pytest.raises(KeyError):
+                hamt.delete(key)
+        versions.append((hamt, dict(d)))
+
+    for hamt, d in versions:
+        assert len(hamt) == len(d)
+        assert hamt == d
+        for key, value in d.items():
+            assert hamt[key] is value
+
+
+def test_hamt_sharing():
+    """Test that unchanged HAMT versions are reused.
+    """
+    hamt = HAMT({'one': 1}, two=2)
+    assert dict(hamt.items()) == {'one': 1, 'two': 2}
+    assert hamt.set('one', 1) is hamt
+    assert hamt.set('one', 11) is not hamt
+    assert hamt['one'] == 1
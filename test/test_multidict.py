@@ -0,0 +1,121 @@
+"""Test the moretools._multidict module.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import pytest
+
+from moretools import DictSet, DictZip, DictStruct
+
+
+def test_dictset():
+    """Test DictSet key union, length and membership.
+    """
+    one, two = {'one': 1, 'two': 2}, {'two': 22, 'three': 3}
+    dictset = DictSet([one, two])
+    assert len(dictset) == 3
+    assert sorted(dictset) == ['one', 'three', 'two']
+    assert 'one' in dictset and 'four' not in dictset
+    assert dictset['one'] == 1
+    with pytest.raises(DictSet.MultipleKey):
+        dictset['two']
+
+    # the cached key union follows size changes of the dicts ...
+    two['four'] = 4
+    assert len(dictset) == 4 and 'four' in dictset
+    del one['one']
+    assert sorted(dictset) == ['four', 'three', 'two']
+    # ... and of the dicts list
+    dictset.__dicts__.append({'five': 5})
+    assert len(dictset) == 4 and 'five' in dictset
+    dictset.__dicts__ = [one]
+    assert list(dictset) == ['two']
+
+    # replacing a key by another keeps the size
+    del one['two']
+    one['one'] = 1
+    assert list(dictset) == ['one']
+    assert list(dictset.items()) == [('one', 1)]
+
+
+def test_dictzip():
+    """Test DictZip construction, lookup and batch lookup.
+    """
+    one, two = {'one': 1, 'two': 2}, {'two': 22, 'three': 3}
+    dictzip = DictZip([one, two])
+    assert dictzip.__dicts__ == [one, two]
+    assert len(dictzip) == 3 and 'three' in dictzip
+    assert dictzip['two'] == (2, 22)
+    with pytest.raises(KeyError):
+        dictzip['one']
+    assert list(dictzip.getmany(['two', 'two'])) == [(2, 22), (2, 22)]
+    with pytest.raises(KeyError) as exc:
+        dictzip.getmany(['two', 'three'])
+    assert exc.value.args == ('three', )
+
+    dictzip.default_value = None
+    assert dictzip['one'] == (1, None)
+    assert list(dictzip.getmany(iter(['three', 'one']))) == [
+      (None, 3), (1, None)]
+    assert list(DictZip([]).getmany(['one'])) == [()]
+
+    class SubZip(DictZip):
+        pass
+
+    subzip = SubZip([one, two], default_value=0)
+    assert subzip['three'] == (0, 3)
+    assert [list(row) for row in subzip.columns(['one', 'two'])] == [
+      [1, 0], [2, 22]]
+
+
+def test_dictstruct():
+    """Test DictStruct key union, length and membership.
+    """
+    base = DictStruct('Base', [{'one': 1}], two=2)
+    struct = DictStruct('Struct', [base, {'three': 3}], {'four': 4})
+    assert len(struct) == 4
+    assert sorted(struct.keys()) == ['four', 'one', 'three', 'two']
+    assert 'one' in struct and 'four' in struct and 'five' not in struct
+    assert struct['one'] == 1
+
+    struct['five'] = 5
+    base['six'] = 6
+    assert len(struct) == 6 and 'six' in struct
+
+
+def test_dictstruct_layers():
+    """Test DictStruct scopes, resolution order and writing to layers.
+    """
+    base = DictStruct('Base', [{'one': 1}], two=2)
+    other = {'one': 11, 'three': 3}
+    struct = DictStruct('Struct', [base, other, base])
+    assert struct.maps == [struct, base, base.__bases__[0], other]
+    assert struct['one'] == 1 and struct['three'] == 3
+
+    child = struct.new_child(four=4)
+    assert child.__bases__ == (struct, ) and child.__name__ == 'Struct'
+    assert child['four'] == 4 and child['two'] == 2
+    child['two'] = 22
+    assert child['two'] == 22 and base['two'] == 2
+    assert child.parents is struct
+    assert 'four' not in struct
+    del child['two']
+    assert child['two'] == 2
+    with pytest.raises(KeyError):
+        del child['one']
+
+    # writes through the maps go to the chosen layer
+    child.maps[2]['five'] = 5
+    assert dict(dict.items(base)) == {'two': 2, 'five': 5} and child['five'] == 5
+    child.maps[-1]['six'] = 6
+    assert child['six'] == 6
+
+    parents = struct.parents
+    assert parents.__bases__ == struct.__bases__ and not dict.__len__(parents)
+
+    # replacing bases anywhere updates the resolution order
+    base.__bases__ = ()
+    assert child['one'] == 11
+    assert child.maps == [child, struct, base, other]
+    with pytest.raises(KeyError):
+        child['seven']
@@ -0,0 +1,144 @@
+"""Test the moretools._multisimpledict module.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+import pytest
+
+from moretools import simpledict, simpledictset, simpledictzip
+
+
+def test_simpledictset():
+    """Test simpledictset() key union, iteration and lookup.
+    """
+    SD = simpledict('SD')
+    one, two = SD(one=1, two=2), SD(two=22, three=3)
+    SDS = simpledictset(
+      'SDS', multiple_key_handler=lambda key, values: tuple(values))
+    sds = SDS([one, two])
+    assert len(sds) == 3
+    assert sorted(SDS.keys(sds)) == ['one', 'three', 'two']
+    assert dict(sds) == {'one': 1, 'two': (2, 22), 'three': 3}
+    assert sds['one'] == 1 and sds.three == 3
+
+    # value changes keep the key index ...
+    index = sds.__keyindex__
+    one.one = 1
+    sds['three'] = 3
+    assert sds.one == 1 and sds.__keyindex__ is index
+    # ... which follows key changes of the simpledicts ...
+    two.four = 4
+    del one['two']
+    assert dict(sds) == {'one': 1, 'two': 22, 'three': 3, 'four': 4}
+    sds['one'] = 11
+    assert one.one == 11
+    # ... and of the dicts list
+    sds.__dicts__.append(SD(five=5))
+    assert len(sds) == 5
+    sds.__dicts__ = [one]
+    assert list(sds) == [('one', 11)]
+
+    with pytest.raises(simpledictset.MultipleKeyError):
+        list(simpledictset('SDS')([one, one]))
+
+    sds = simpledictset('SDS', iterate='keys')([one, two])
+    assert 'one' in sds and 'five' not in sds and [] not in sds
+
+
+def test_simpledictzip():
+    """Test simpledictzip() iteration and lookup.
+    """
+    SD = simpledict('SD')
+    one, two = SD(one=1, two=2), SD(two=22, three=3)
+    sdz = simpledictzip('SDZ', default_value=None)([one, two])
+    assert len(sdz) == 3
+    assert dict(list(sdz)) == {'one': (1, None), 'two': (2, 22), 'three': (None, 3)}
+    assert sdz['two'] == sdz.two == (2, 22)
+    two.one = 11
+    assert sdz.one == (1, 11)
+
+    sdz = simpledictzip('SDZ')([one, two])
+    assert sdz['two'] == (2, 22)
+    with pytest.raises(KeyError):
+        sdz['three']
+
+
+@pytest.mark.parametrize('numpy', [True, False])
+def test_simpledictzip_columns(numpy, monkeypatch):
+    """Test simpledictzip columns() with and without numpy.
+    """
+    from moretools import _multidict
+
+    if numpy:
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(_multidict, '_numpy', False)
+    SD = simpledict('SD')
+    one, two = SD(one=1, two=2), SD(two=22.5, three=3)
+    SDZ = simpledictzip('SDZ', default_value=0)
+    columns = SDZ.columns(SDZ([one, two]), ['one', 'two', 'three'])
+    assert [list(row) for row in columns] == [[1, 0], [2, 22.5], [0, 3]]
+    if numpy:
+        assert columns.shape == (3, 2) and columns.dtype.char == 'd'
+    else:
+        assert all(row.typecode == 'd' for row in columns)
+
+    columns = SDZ.columns(SDZ([one, two]), ['one'], typecode='l')
+    assert [list(row) for row in columns] == [[1, 0]]
+    assert len(SDZ.columns(SDZ([one, two]), [])) == 0
+
+    SDZ = simpledictzip('SDZ')
+    with pytest.raises(KeyError) as exc:
+        SDZ.columns(SDZ([one, two]), ['two', 'one'])
+    assert exc.value.args == ('one', )
+
+
+def test_simpledictset_resolution():
+    """Test simpledictset() resolution of ambiguous keys and attributes.
+    """
+    SD = simpledict('SD')
+    Upper = simpledict(
+      'Upper', key_to_attr=str.upper, attr_to_key=str.lower)
+    one, two = SD(one=1, two=2), Upper(two=22, three=3)
+    sds = simpledictset('SDS')([one, two])
+    assert sds['one'] == sds.one == 1
+    assert sds['three'] == sds.THREE == 3
+    assert sds.two == 2 and sds.TWO == 22
+    with pytest.raises(simpledictset.MultipleKeyError):
+        sds['two']
+    with pytest.raises(KeyError):
+        sds['four']
+
+    two.FOUR = 4
+    assert sds.FOUR == sds['four'] == 4
+    one['four'] = 44
+    with pytest.raises(simpledictset.MultipleKeyError):
+        sds['four']
+
+    sds = simpledictset(
+      'SDS', multiple_attr_handler=lambda name, values: sum(values))(
+      [one, SD(one=10)])
+    assert sds.one == 11
+
+    # inherited struct items
+    struct = SD.struct('Struct', [SD(five=5)])
+    SDS = simpledictset('SDS')
+    sds = SDS([one, struct])
+    assert sds['five'] == sds.five == 5
+    struct.__bases__[0]['six'] = 6
+    assert sds['six'] == 6
+
+    # replacing members in-place
+    sds.__dicts__[1] = SD(seven=7)
+    assert sds['seven'] == sds.seven == 7
+    assert sorted(SDS.keys(sds)) == ['four', 'one', 'seven', 'two']
+
+    # direct changes of view mappings
+    backing = {'eight': 8}
+    sds.__dicts__[1] = SD.view(backing)
+    assert sds.eight == 8
+    backing['nine'] = 9
+    assert sds['nine'] == sds.nine == 9 and 'nine' in SDS.keys(sds)
+    del backing['eight']
+    with pytest.raises(AttributeError):
+        sds.eight
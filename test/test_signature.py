@@ -0,0 +1,116 @@
+"""Test the moretools._signature module.
+
+.. moduleauthor:: Stefan Zimmermann <zimmermann.code@gmail.com>
+"""
+
+from functools import partial
+
+import pytest
+from six import PY2
+
+from moretools._signature import ArgSpec, argspec
+
+
+def test_argspec():
+    """Test argspec() with functions, methods and other callables.
+    """
+    def func(one, two=2, *args, **kwargs):
+        pass
+
+    assert argspec(func) == ArgSpec(
+      ['one', 'two'], 'args', 'kwargs', [], (2, ))
+    # memoized per code object
+    assert argspec(func).args is argspec(func).args
+
+    class Type(object):
+        def method(self, arg):
+            pass
+
+    assert argspec(Type().method) == ArgSpec(
+      ['self', 'arg'], None, None, [], None)
+    assert argspec(Type.method) == argspec(Type().method)
+
+
+def test_argspec_memo(monkeypatch):
+    """Test that argspec() only memoizes the most recent code objects.
+    """
+    from moretools import _signature
+
+    monkeypatch.setattr(_signature, '_argspecs_maxsize', 2)
+    funcs = []
+    for index in range(4):
+        namespace = {}
+        exec('def func(arg%d): pass' % index, namespace)
+        funcs.append(namespace['func'])
+        assert argspec(funcs[-1]).args == ['arg%d' % index]
+        assert len(_signature._argspecs) <= 2
+    assert list(_signature._argspecs) == [f.__code__ for f in funcs[2:]]
+
+
+@pytest.mark.skipif(PY2, reason="getargspec() only supports functions")
+def test_argspec_with_other_callables():
+    """Test argspec() with callables not having a code object.
+    """
+    def func(one, two, three=3):
+        pass
+
+    spec = argspec(partial(func, 1))
+    assert spec.args[-1] == 'three'
+    assert spec.varargs is None and spec.varkw is None
+
+
+def test_fastwrap():
+    """Test that fastwrap() passes arguments like decorator.decorator().
+    """
+    from decorator import decorator
+
+    from moretools._signature import fastwrap
+
+    def caller(func, *args, **kwargs):
+        return args, kwargs
+
+    def func(one, two=2, *args):
+        pass
+
+    for wrap in [decorator, fastwrap]:
+        wrapper = wrap(caller, func)
+        assert wrapper.__name__ == 'func'
+        assert wrapper(1) == ((1, 2), {})
+        assert wrapper(two=3, one=1) == ((1, 3), {})
+        assert wrapper(1, 2, 3) == ((1, 2, 3), {})
+
+    def func(one, **kwargs):
+        pass
+
+    for wrap in [decorator, fastwrap]:
+        wrapper = wrap(caller, func)
+        assert wrapper(1, two=2) == ((1, ), {'two': 2})
+        assert wrapper(one=1) == ((1, ), {})
+        with pytest.raises(TypeError) as exc:
+            wrapper(1, 2)
+        assert 'func()' in str(exc.value)
+
+    def func(one, two=2):
+        pass
+
+    with pytest.raises(TypeError) as exc:
+        fastwrap(caller, func)(1, 2, 3)
+    assert 'caller' not in str(exc.value)
+
+
+@pytest.mark.skipif(PY2, reason="no keyword-only arguments")
+def test_fastwrap_kwonly():
+    """Test that fastwrap() binds keyword-only arguments with defaults.
+    """
+    from moretools._signature import fastwrap
+
+    namespace = {}
+    exec('def func(one, *, two=2):\n    pass', namespace)
+    func = namespace['func']
+
+    def caller(func, *args, **kwargs):
+        return args, kwargs
+
+    wrapper = fastwrap(caller, func)
+    for call in wrapper(1), wrapper(1, two=2), wrapper(one=1):
+        assert call == ((1, ), {'two': 2})
@@ -18,6 +18,11 @@ from moretools._simpledict import (
   )
 
 
+class SubDict(simpledict('SubDict')):
+    """Derived simpledict class, which is pickled by reference.
+    """
+
+
 def test_aliases():
     """Test if the simpledict.(...)base class alias attributes
        are correctly assigned.
@@ -97,3 +102,444 @@ def test_simpledict():
     assert not hasattr(SD, 'frozen')
     assert not hasattr(SD, 'struct')
     check_class(SD, 'SD')
+
+
+def test_simpledict_fields():
+    """Test compact simpledict(..., fields=[...]) classes.
+    """
+    import sys
+
+    SD = simpledict('SD', fields=['one', 'two'])
+    check_class(SD, 'SD')
+    check_frozenclass(SD.frozen, 'SD')
+    check_structclass(SD.struct, 'SD')
+    assert issubclass(SD, simpledict.fieldsbase)
+    assert issubclass(SD.frozen, simpledict.fieldsbase)
+    assert not issubclass(SD.struct, simpledict.fieldsbase)
+
+    sd = SD(one=1)
+    assert sd.one == sd['one'] == 1
+    assert not hasattr(sd, 'two')
+    assert 'two' not in dir(sd)
+    assert len(sd) == 1
+    assert list(sd) == [('one', 1)]
+    assert sd.__dict__ == {'one': 1}
+
+    sd.two = 2
+    assert sd['two'] == 2
+    assert list(sd) == [('one', 1), ('two', 2)]
+    del sd['one']
+    assert dict(sd) == {'two': 2}
+    with pytest.raises(KeyError):
+        sd['one']
+    with pytest.raises(AttributeError):
+        sd.one
+
+    with pytest.raises(KeyError):
+        sd['three'] = 3
+    with pytest.raises(KeyError):
+        SD(three=3)
+
+    frozen = SD.frozen(one=1)
+    assert frozen.one == 1
+    with pytest.raises(NotImplementedError):
+        frozen.one = 2
+    assert frozen.__dict__ == {'one': 1}
+    assert repr(frozen) == "simpledict({'one': 1})"
+    assert dict(frozen) == {'one': 1}
+
+    # instances don't hold an internal mapping
+    plain = simpledict('Plain')(one=1, two=2)
+    assert 3 * sys.getsizeof(SD(one=1, two=2)) \
+      < sys.getsizeof(plain) + sys.getsizeof(plain.__dict__)
+
+    with pytest.raises(simpledict.KeyToAttrError):
+        simpledict('SD', fields=['in-valid'])
+
+
+def test_simpledict_checked():
+    """Test the remembered key<-->attrname conversion checks.
+    """
+    converted = []
+
+    def key_to_attr(key):
+        converted.append(key)
+        return key.replace('-', '_')
+
+    SD = simpledict('SD', key_to_attr=key_to_attr,
+                    attr_to_key=lambda name: name.replace('_', '-'))
+    sd = SD({'one-two': 12})
+    sd['one-two'] = 21
+    SD.frozen({'one-two': 12})
+    # conversion was checked only once for all classes of the family
+    assert converted == ['one-two']
+    sd.one_two = 12
+    sd.one_two = 21
+    assert sd['one-two'] == 21
+    # and once for the reverse attrname-->key check
+    assert converted == ['one-two', 'one-two']
+
+    with pytest.raises(simpledict.KeyToAttrError):
+        sd['in valid'] = 0
+    with pytest.raises(simpledict.KeyToAttrError):
+        sd['in valid'] = 0
+    assert 'in valid' not in SD._checked_attrs
+
+    type(SD).checked_maxsize = 2
+    sd['two'] = sd['three'] = 0
+    assert len(SD._checked_attrs) <= 2
+
+    SD.clear_checked()
+    assert not SD._checked_attrs and not SD._checked_keys
+    sd['one-two'] = 0
+    assert converted[-1] == 'one-two'
+
+
+def test_simpledict_from_records():
+    """Test bulk simpledict instance creation.
+    """
+    SD = simpledict('SD')
+    records = [{'one': 1}, [('one', 2), ('two', 2)]]
+    for cls in [
+      SD, SD.frozen, SD.persistent, SD.view,
+      simpledict('SD', fields=['one', 'two']),
+    ]:
+        sds = cls.from_records(records)
+        assert [type(sd) for sd in sds] == [cls, cls]
+        assert [dict(sd) for sd in sds] == [{'one': 1}, {'one': 2, 'two': 2}]
+        assert sds[1].two == 2
+
+        sds = cls.from_columns(one=[1, 2], two=(3, 4))
+        assert [dict(sd) for sd in sds] \
+          == [{'one': 1, 'two': 3}, {'one': 2, 'two': 4}]
+        with pytest.raises(ValueError):
+            cls.from_columns(one=[1, 2], two=[3])
+
+    with pytest.raises(simpledict.KeyToAttrError):
+        SD.from_records([{'one': 1}, {'in valid': 2}])
+    with pytest.raises(KeyError):
+        simpledict('SD', fields=['one']).from_columns(two=[2])
+    with pytest.raises(TypeError):
+        SD.struct.from_records([])
+    assert SD.persistent.from_records([{'one': 1}])[0] == SD.persistent(one=1)
+
+
+def test_simpledict_contains():
+    """Test the different membership modes of simpledict `in` checks.
+    """
+    for SD in simpledict('SD'), simpledict('SD', fields=['one', 'two']):
+        sd = SD(one=1)
+        assert ('one', 1) in sd and ('one', 1.0) in sd
+        assert ('one', 2) not in sd and ['one', 1] not in sd
+        assert 'one' not in sd and [] not in sd
+        assert SD.has_item(sd, ('one', 1))
+        assert not SD.has_item(sd, ('two', 1))
+
+    sd = simpledict('SD', contains='keys')(one=1)
+    assert 'one' in sd and 'two' not in sd and [] not in sd
+    assert ('one', 1) not in sd
+    assert list(sd) == [('one', 1)]
+
+    sd = simpledict('SD', iterate='keys')(one=1)
+    assert 'one' in sd and 1 not in sd
+    sd = simpledict('SD', iterate='values')(one=1)
+    assert 1 in sd and 'one' not in sd
+
+    struct = simpledict('SD', contains='keys').struct('S', [sd], {'two': 2})
+    assert 'one' in struct and 'two' in struct and 'three' not in struct
+
+
+def test_simpledict_struct():
+    """Test simpledict struct item inheritance and its cached resolution.
+    """
+    from moretools._simpledict import _flatten, _track
+
+    SD = simpledict('SD')
+    base = SD(one=1, two=2)
+    middle = SD.struct('Middle', [base], {'two': 22})
+    top = SD.struct('Top', [middle, SD(three=3)], {})
+    assert repr(top) == 'Top'
+    assert top['one'] == 1 and top['two'] == 22 and top.three == 3
+    assert dict(top) == {'one': 1, 'two': 22, 'three': 3}
+    # resolution is cached until the struct or one of its bases changes
+    assert _flatten(top)[0] is _flatten(top)[0]
+
+    base['one'] = 11
+    assert top['one'] == 11
+    del middle['two']
+    assert top['two'] == 2
+    base.four = 4
+    assert dict(top) == {'one': 11, 'two': 2, 'three': 3, 'four': 4}
+
+    middle.__bases__ = (SD(one=111),)
+    assert top['one'] == 111
+    with pytest.raises(KeyError):
+        top['two']
+    base['two'] = 222
+    assert 'two' not in dict(top)
+
+    # non-simpledict bases are not cached
+    other = {'five': 5}
+    top.__bases__ = (middle, other)
+    assert top['five'] == 5
+    other['five'] = 55
+    assert top['five'] == 55
+    # ... but looked up base by base, without flattening
+    assert _track(top).uncacheable == _track(top).keyversion
+    other['one'] = 1
+    assert top['one'] == 111 and top['five'] == 55
+    top.__bases__ = (middle, )
+    assert top['one'] == 111
+    assert _flatten(top)[0] is _flatten(top)[0]
+
+
+def test_simpledict_struct_call():
+    """Test creating basic simpledicts and views from simpledict structs.
+    """
+    SD = simpledict('SD')
+    base = SD(one=1, two=2)
+    struct = SD.struct('Struct', [base], {'two': 22})
+
+    sd = struct()
+    assert type(sd) is SD
+    assert dict(sd) == {'one': 1, 'two': 22}
+    sd.one = 11
+    assert struct['one'] == 1
+
+    view = struct(view=True)
+    assert type(view) is SD.view
+    assert issimpledict(view)
+    assert dict(view) == {'one': 1, 'two': 22}
+    assert ('two', 22) in view and view.two == 22
+    view.three = 3
+    view['one'] = 11
+    assert dict(view) == {'one': 11, 'two': 22, 'three': 3}
+    assert dict(struct) == {'one': 1, 'two': 22}
+    assert view.__dict__.maps[0] == {'one': 11, 'three': 3}
+    # deleting struct items
+    del view.two
+    assert not hasattr(view, 'two') and 'two' not in dir(view)
+    assert dict(view) == {'one': 11, 'three': 3} and len(view) == 2
+    assert struct.two == 22
+    with pytest.raises(KeyError):
+        del view['two']
+    del view['one']
+    assert dict(view) == {'three': 3}
+    view.two = 2
+    assert dict(view) == {'two': 2, 'three': 3}
+    # the view is not affected by later struct changes
+    base['four'] = 4
+    assert 'four' not in dir(view)
+
+    view = SD.view({'one': 1})
+    view.two = 2
+    assert view.__dict__ == {'one': 1, 'two': 2}
+    assert repr(view) == "simpledict(%r)" % dict(view)
+
+
+def test_simpledict_view():
+    """Test zero-copy simpledict views with lazy key checks.
+    """
+    try:
+        from types import MappingProxyType
+    except ImportError: # PY2
+        MappingProxyType = dict
+
+    items = {'one': 1, 'in valid': 2}
+    view = simpledict.view(items)
+    assert type(view).__name__ == 'simpledict.view'
+    assert view.__dict__ is items
+    assert view.one == 1 and view['in valid'] == 2
+    with pytest.raises(AttributeError):
+        view.two
+    with pytest.raises(simpledict.KeyToAttrError):
+        dir(view)
+    items['two'] = 2
+    assert view.two == 2
+    view.three = 3
+    assert items['three'] == 3
+    with pytest.raises(simpledict.KeyToAttrError):
+        view['in-valid'] = 0
+
+    SD = simpledict('SD', key_to_attr=lambda key: key.upper())
+    view = SD.view(MappingProxyType({'one': 1}))
+    assert view['one'] == 1
+    with pytest.raises(simpledict.AttrToKeyToAttrMismatch):
+        view.one
+
+    # direct changes of view mappings reach inheriting structs
+    SD = simpledict('SD')
+    backing = {'one': 1}
+    struct = SD.struct('Struct', [SD.view(backing)])
+    assert struct['one'] == 1
+    backing['one'] = 11
+    backing['two'] = 2
+    assert struct['one'] == 11 and struct.two == 2
+    assert dict(struct) == {'one': 11, 'two': 2}
+
+
+def test_simpledict_persistent():
+    """Test the hashable, persistent frozen simpledict variant.
+    """
+    SD = simpledict('SD')
+    sd = SD.persistent(one=1)
+    assert issimplefrozendict(sd)
+    with pytest.raises(NotImplementedError):
+        sd.two = 2
+    with pytest.raises(NotImplementedError):
+        del sd['one']
+
+    other = sd.set('two', 2)
+    assert dict(sd) == {'one': 1}
+    assert dict(other) == {'one': 1, 'two': 2} and other.two == 2
+    assert sd.set('one', 1) is sd
+    assert other.delete('two') == sd
+    with pytest.raises(KeyError):
+        sd.delete('two')
+    with pytest.raises(simpledict.KeyToAttrError):
+        sd.set('in valid', 0)
+
+    assert other == SD.persistent({'two': 2}, one=1) != sd
+    assert {other: 'other'}[SD.persistent(one=1, two=2)] == 'other'
+    assert SD.persistent(one=1) != SD.frozen(one=1)
+
+
+def test_simpledict_intern():
+    """Test simpledict(..., intern=True) frozen instance sharing.
+    """
+    import gc
+
+    SD = simpledict('SD', intern=True)
+    check_frozenclass(SD.frozen, 'SD')
+    sd = SD.frozen(one=1)
+    assert SD.frozen({'one': 1}) is sd
+    assert SD.frozen(one=2) is not sd
+    assert SD.frozen(one=[1]) is not SD.frozen(one=[1])
+    assert SD(one=1) is not SD(one=1)
+    assert len(SD.frozen.interned) == 1
+
+    # interned instances can't be changed
+    with pytest.raises(NotImplementedError):
+        del sd['one']
+    with pytest.raises(NotImplementedError):
+        del sd.one
+    assert SD.frozen(one=1) is sd and sd.one == 1
+
+    records = SD.frozen.from_records([{'one': 1}, {'one': 2}])
+    assert records[0] is sd
+    assert records[1] is SD.frozen.from_columns(one=[2])[0]
+    assert len(SD.frozen.interned) == 2
+
+    del sd, records
+    gc.collect()
+    assert not len(SD.frozen.interned)
+
+    one = SD.frozen(one=1)
+    # equal values of different types are not shared
+    assert SD.frozen(one=True) is not one and SD.frozen(one=True).one is True
+    assert type(SD.frozen(one=1.0).one) is float
+    assert SD.frozen.from_records([{'one': True}])[0].one is True
+
+    SD = simpledict('SD')
+    assert SD.frozen(one=1) is not SD.frozen(one=1)
+
+
+def test_simpledict_observable():
+    """Test simpledict(..., observable=True) dirty-tracking.
+    """
+    commits = []
+
+    for SD in [
+      simpledict('SD', observable=True),
+      simpledict('SD', fields=['one', 'two', 'three'], observable=True),
+    ]:
+        del commits[:]
+        check_class(SD, 'SD')
+        check_frozenclass(SD.frozen, 'SD')
+        check_structclass(SD.struct, 'SD')
+        assert isinstance(SD(), simpledict.observablebase)
+        assert not isinstance(SD.frozen(), simpledict.observablebase)
+
+        sd = SD(one=1, two=2)
+        SD.subscribe(sd, lambda sd, keys: commits.append(keys))
+        assert SD.changed(sd) == set()
+        sd['one'] = 11
+        sd.three = 3
+        del sd.two
+        assert SD.changed(sd) == {'one', 'two', 'three'}
+        assert dict(sd) == {'one': 11, 'three': 3}
+        assert SD.commit(sd) == {'one', 'two', 'three'}
+        assert SD.commit(sd) == set()
+        del sd['three']
+        SD.commit(sd)
+        assert commits == [{'one', 'two', 'three'}, {'three'}]
+
+        sd = SD.from_records([{'one': 1}])[0]
+        sd.one = 2
+        assert SD.changed(sd) == {'one'}
+
+        with pytest.raises(TypeError):
+            SD.changed(SD.struct('S', []))
+
+
+def test_simpledict_pickle():
+    """Test pickling of simpledict instances by registered type ids.
+    """
+    import pickle
+
+    from moretools._simpledict import _families
+
+    SD = simpledict('SD', typeid='test.SD')
+    sd = SD(one=1)
+    for obj in [
+      sd, SD.frozen(one=1), SD.persistent(one=1), SD.view({'one': 1}),
+      simpledict.view({'one': 1}), SD.struct('S', [sd], {'two': 2}),
+    ]:
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(obj, protocol))
+            assert type(restored) is type(obj)
+            assert dict(restored) == dict(obj)
+    assert pickle.loads(pickle.dumps(SD.struct('S', [sd]))).__bases__[0].one
+
+    SD = simpledict('SD', typeid='test.SD.intern', intern=True)
+    frozen = SD.frozen(one=1)
+    for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+        assert pickle.loads(pickle.dumps(frozen, protocol)) is frozen
+    assert simpledict.loads(simpledict.dumps(frozen)) is frozen
+
+    # not directly created by simpledict(): pickled by reference
+    sub = pickle.loads(pickle.dumps(SubDict(one=1), 2))
+    assert type(sub) is SubDict and sub.one == 1
+
+    # only registered with explicit typeid
+    Rec, FieldsRec = simpledict('Rec'), simpledict('Rec', fields=['one'])
+    assert 'Rec' not in _families
+    with pytest.raises(pickle.PicklingError):
+        pickle.dumps(Rec(one=1))
+    with pytest.raises(TypeError):
+        simpledict.dumps(FieldsRec(one=1))
+
+    data = pickle.dumps(simpledict('Unregistered', typeid='test.U')())
+    del _families['test.U']
+    with pytest.raises(LookupError):
+        pickle.loads(data)
+
+
+@pytest.mark.parametrize('codec', ['json', 'msgpack'])
+def test_simpledict_dumps(codec):
+    """Test simpledict.dumps() and .loads() with the different codecs.
+    """
+    if codec == 'msgpack':
+        pytest.importorskip('msgpack')
+    SD = simpledict('SD', typeid='test.SD')
+    sd = SD(one=1, two=SD.frozen(three=[3]))
+    data = simpledict.loads(simpledict.dumps([sd, {'four': 4}], codec), codec)
+    assert data[1] == {'four': 4}
+    sd = data[0]
+    assert type(sd) is SD and type(sd.two) is SD.frozen
+    assert sd.one == 1 and sd.two.three == [3]
+
+    with pytest.raises(TypeError):
+        simpledict.dumps(SubDict(), codec)
+    with pytest.raises(ValueError):
+        simpledict.dumps(sd, 'unknown')